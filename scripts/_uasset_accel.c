@@ -0,0 +1,184 @@
+/*
+ * Optional accelerator for get_actor_name.py.
+ *
+ * Implements the two Python-level loops of the label parser with results
+ * identical to the pure-Python versions:
+ *
+ *   scan_name_map_location  <->  _scan_name_map_location_py
+ *   find_label_names        <->  _find_label_names_py
+ *
+ * Build with `python scripts/build_accel.py`. get_actor_name.py imports the
+ * module if it is present and falls back to Python otherwise.
+ */
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <stdint.h>
+#include <string.h>
+
+#define MAX_KEYS 8
+
+static int32_t
+read_i32(const unsigned char *p)
+{
+    return (int32_t)((uint32_t)p[0] | (uint32_t)p[1] << 8 |
+                     (uint32_t)p[2] << 16 | (uint32_t)p[3] << 24);
+}
+
+/* scan_name_map_location(data, size, header_limit, max_count) -> (count, offset) */
+static PyObject *
+scan_name_map_location(PyObject *Py_UNUSED(self), PyObject *args)
+{
+    Py_buffer buf;
+    Py_ssize_t size, header_limit, max_count;
+    if (!PyArg_ParseTuple(args, "y*nnn", &buf, &size, &header_limit, &max_count))
+        return NULL;
+
+    const unsigned char *p = buf.buf;
+    Py_ssize_t header_len = buf.len < header_limit ? buf.len : header_limit;
+    Py_ssize_t limit = header_len - 20;
+    int32_t count = 0, offset = 0;
+
+    for (Py_ssize_t off = 20; off + 4 < limit; off++) {
+        if (p[off] == 0 || p[off + 1] || p[off + 2] || p[off + 3])
+            continue;
+        /* Same window as the regex: the lookahead must end before limit */
+        if (p[off + 4] != '/' &&
+            !(off + 8 <= limit && memcmp(p + off + 4, "None", 4) == 0))
+            continue;
+        Py_ssize_t base = off + 4 + p[off];
+        if (base <= limit && base + 12 <= header_len) {
+            int32_t nc = read_i32(p + base + 4);
+            int32_t no = read_i32(p + base + 8);
+            if (0 < nc && nc < max_count && 0 < no && no < size) {
+                count = nc;
+                offset = no;
+                break;
+            }
+        }
+    }
+    PyBuffer_Release(&buf);
+    return Py_BuildValue("(ii)", count, offset);
+}
+
+/* Entry [start, start + raw_len) of serialized length s_len equals key */
+static int
+entry_matches(const unsigned char *p, Py_ssize_t start, int32_t s_len,
+              const char *key, Py_ssize_t key_len)
+{
+    if (s_len > 0) {
+        if ((Py_ssize_t)s_len != key_len + 1)
+            return 0;
+    }
+    else if (key_len & 1 || (Py_ssize_t)s_len != -(key_len / 2 + 1)) {
+        return 0;
+    }
+    return memcmp(p + start, key, key_len) == 0;
+}
+
+/*
+ * find_label_names(data, offset, count, hashes, label_keys, type_key)
+ *     -> (choice, label_index, type_index, truncated)
+ *
+ * Walks the name map once for the first occurrence of type_key and of the
+ * most preferred label key present. choice is the position in label_keys
+ * (-1 if none). truncated is True when a name is missing and the data
+ * ended (or was malformed) before count entries.
+ */
+static PyObject *
+find_label_names(PyObject *Py_UNUSED(self), PyObject *args)
+{
+    Py_buffer buf;
+    Py_ssize_t offset, count;
+    PyObject *hashes_obj, *label_keys;
+    const char *type_key;
+    Py_ssize_t type_len;
+    if (!PyArg_ParseTuple(args, "y*nnOO!y#", &buf, &offset, &count, &hashes_obj,
+                          &PyTuple_Type, &label_keys, &type_key, &type_len))
+        return NULL;
+
+    Py_ssize_t nkeys = PyTuple_GET_SIZE(label_keys);
+    if (nkeys > MAX_KEYS) {
+        PyBuffer_Release(&buf);
+        PyErr_SetString(PyExc_ValueError, "too many label keys");
+        return NULL;
+    }
+    const char *keys[MAX_KEYS];
+    Py_ssize_t key_lens[MAX_KEYS];
+    for (Py_ssize_t k = 0; k < nkeys; k++) {
+        PyObject *key = PyTuple_GET_ITEM(label_keys, k);
+        if (!PyBytes_Check(key)) {
+            PyBuffer_Release(&buf);
+            PyErr_SetString(PyExc_TypeError, "label keys must be bytes");
+            return NULL;
+        }
+        keys[k] = PyBytes_AS_STRING(key);
+        key_lens[k] = PyBytes_GET_SIZE(key);
+    }
+    /* hashes: True/False, or None to detect the hash pair per entry */
+    int hashes = hashes_obj == Py_None ? -1 : PyObject_IsTrue(hashes_obj);
+    if (hashes == -1 && hashes_obj != Py_None) {
+        PyBuffer_Release(&buf);
+        return NULL;
+    }
+
+    const unsigned char *p = buf.buf;
+    Py_ssize_t avail = buf.len;
+    Py_ssize_t pos = offset;
+    Py_ssize_t i = 0;
+    Py_ssize_t choice = -1, label_index = -1, type_index = -1;
+
+    while (i < count && pos >= 0 && pos + 4 <= avail) {
+        int32_t s_len = read_i32(p + pos);
+        Py_ssize_t start = pos + 4;
+        Py_ssize_t end = start + (s_len > 0 ? (Py_ssize_t)s_len : -(Py_ssize_t)s_len * 2);
+        if (end > avail || s_len == 0)
+            break;
+        if (type_index < 0 && entry_matches(p, start, s_len, type_key, type_len))
+            type_index = i;
+        Py_ssize_t better = choice < 0 ? nkeys : choice;
+        for (Py_ssize_t k = 0; k < better; k++) {
+            if (entry_matches(p, start, s_len, keys[k], key_lens[k])) {
+                choice = k;
+                label_index = i;
+                break;
+            }
+        }
+        pos = end;
+        if (hashes == 1) {
+            pos += 4;
+        }
+        else if (hashes == -1 && pos + 4 <= avail) {
+            int32_t nv = read_i32(p + pos);
+            if (nv == 0 || nv < -512 || nv > 512)
+                pos += 4;
+        }
+        i++;
+        if (choice == 0 && type_index >= 0)
+            break;
+    }
+    int truncated = (label_index < 0 || type_index < 0) && i < count;
+    PyBuffer_Release(&buf);
+    return Py_BuildValue("(nnnO)", choice, label_index, type_index,
+                         truncated ? Py_True : Py_False);
+}
+
+static PyMethodDef accel_methods[] = {
+    {"scan_name_map_location", scan_name_map_location, METH_VARARGS,
+     "scan_name_map_location(data, size, header_limit, max_count) -> (count, offset)"},
+    {"find_label_names", find_label_names, METH_VARARGS,
+     "find_label_names(data, offset, count, hashes, label_keys, type_key)\n"
+     "-> (choice, label_index, type_index, truncated)"},
+    {NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef accel_module = {
+    PyModuleDef_HEAD_INIT, "_uasset_accel",
+    "C versions of the get_actor_name.py header scan and name map walk.",
+    -1, accel_methods, NULL, NULL, NULL, NULL
+};
+
+PyMODINIT_FUNC
+PyInit__uasset_accel(void)
+{
+    return PyModule_Create(&accel_module);
+}
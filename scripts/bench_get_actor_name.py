@@ -10,21 +10,48 @@ import glob
 # Import the module to be benchmarked
 import get_actor_name
 
+def _percentile(sorted_values, q):
+    """q-th percentile (0-100) of sorted values, linearly interpolated."""
+    if not sorted_values:
+        return 0.0
+    pos = (len(sorted_values) - 1) * q / 100
+    lo = int(pos)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (pos - lo)
+
+def _summarize(samples, ops, total_bytes=None):
+    """
+    Distribution of timing samples (any unit) plus throughput: ops and bytes
+    processed in all samples together, per second of summed sample time
+    (samples must then be in ms).
+    """
+    ordered = sorted(samples)
+    elapsed_s = sum(ordered) / 1000
+    stats = {
+        "samples": len(ordered),
+        "min": ordered[0],
+        "p50": _percentile(ordered, 50),
+        "p95": _percentile(ordered, 95),
+        "p99": _percentile(ordered, 99),
+        "max": ordered[-1],
+        "mean": statistics.mean(ordered),
+        "stdev": statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+        "ops_per_s": ops / elapsed_s if elapsed_s > 0 else 0.0,
+    }
+    if total_bytes is not None:
+        stats["bytes_per_s"] = total_bytes / elapsed_s if elapsed_s > 0 else 0.0
+    return stats
+
 def _format_stats(times_ms, runs, total_files):
+    stats = _summarize(times_ms, runs * total_files)
     return (
         "Benchmark (ms): runs={runs} files_per_run={files}\n"
-        "  Total Time: min={min_v:.3f} avg={avg_v:.3f} max={max_v:.3f}\n"
-        "  Per File:   avg={per_file:.3f}"
-    ).format(
-        runs=runs,
-        files=total_files,
-        min_v=min(times_ms),
-        avg_v=statistics.mean(times_ms),
-        max_v=statistics.median(times_ms), # Using median for average to be more robust
-        per_file=statistics.mean(times_ms) / total_files if total_files > 0 else 0
-    )
+        "  Total Time: min={min:.3f} p50={p50:.3f} mean={mean:.3f} max={max:.3f}\n"
+        "  Per File:   mean={per_file:.4f} files/s={ops_per_s:.0f}"
+    ).format(runs=runs, files=total_files,
+             per_file=stats["mean"] / total_files if total_files > 0 else 0, **stats)
 
-def _time_runs(action, runs, warmup=1, disable_gc=False):
+def _time_runs(action, runs, warmup=1, disable_gc=False, before=None):
     if runs < 1:
         raise ValueError("runs must be >= 1")
     if warmup < 0:
@@ -42,6 +69,8 @@ def _time_runs(action, runs, warmup=1, disable_gc=False):
         # Measured runs
         timings_ms = []
         for _ in range(runs):
+            if before is not None:
+                before()
             start = time.perf_counter_ns()
             action()
             timings_ms.append((time.perf_counter_ns() - start) / 1_000_000)
@@ -51,48 +80,463 @@ def _time_runs(action, runs, warmup=1, disable_gc=False):
 
     return timings_ms
 
-def process_single_file(file_path):
+def evict_page_cache(files):
     """
-    Encapsulates the logic of processing a single file using the parser.
+    Best-effort cold cache: ask the OS to drop cached pages of each file.
+    Returns False where this is not supported (e.g. Windows).
     """
-    try:
-        parser = get_actor_name.UAssetParser(file_path)
-        if parser.parse_name_map():
-            parser.extract_label_property()
-    except Exception:
-        pass 
+    fadvise = getattr(os, "posix_fadvise", None)
+    if fadvise is None:
+        return False
+    for f in files:
+        try:
+            fd = os.open(f, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+    return True
 
-def run_benchmark(search_path, runs=3, warmup=1, disable_gc=False, recursive=True):
+def _enumerate_files(search_path, recursive=True, ofpa_only=False):
+    if not recursive:
+        return glob.glob(os.path.join(search_path, "*.uasset"))
+    return list(get_actor_name._iter_uasset_files(search_path, ofpa_only))
+
+def _format_enumeration(search_path, runs, recursive=True, ofpa_only=False):
+    """Enumeration time of the scandir walker, with glob as the baseline."""
+    modes = [("scandir", lambda: _enumerate_files(search_path, recursive, ofpa_only))]
+    if recursive and not ofpa_only:
+        modes.append(("glob", lambda: glob.glob(os.path.join(search_path, "**/*.uasset"),
+                                                recursive=True)))
+    parts = []
+    for name, action in modes:
+        times = _time_runs(action, runs)
+        parts.append(f"{name} min={min(times):.3f} median={statistics.median(times):.3f}")
+    return "Enumeration (ms): " + " | ".join(parts)
+
+def run_benchmark(search_path, runs=3, warmup=1, disable_gc=False, recursive=True,
+                  jobs_list=(1,), cold=False, backend="thread", ofpa_only=False):
     search_path = os.path.abspath(search_path)
     
     files = []
+    reports = []
     if os.path.isfile(search_path):
          files = [search_path]
          print(f"Benchmarking single file: {search_path}")
     else:
         print(f"Scanning for .uasset files in: {search_path}...")
-        pattern = "**/*.uasset" if recursive else "*.uasset"
-        files = glob.glob(os.path.join(search_path, pattern), recursive=recursive)
+        files = _enumerate_files(search_path, recursive, ofpa_only)
+        reports.append(_format_enumeration(search_path, runs, recursive, ofpa_only))
     
     if not files:
         return "No .uasset files found."
         
     print(f"Found {len(files)} files. Starting benchmark...")
 
-    def workload():
-        for f in files:
-            process_single_file(f)
-
-    with open(os.devnull, "w") as sink:
-        with contextlib.redirect_stdout(sink), contextlib.redirect_stderr(sink):
-            timings = _time_runs(
-                workload,
-                runs,
-                warmup=warmup,
-                disable_gc=disable_gc,
-            )
-    
-    return _format_stats(timings, runs, len(files))
+    before = None
+    if cold:
+        if evict_page_cache(files[:1]):
+            before = lambda: evict_page_cache(files)
+        else:
+            print("Cold cache not supported on this platform, measuring warm cache.")
+
+    for jobs in jobs_list:
+        def workload(jobs=jobs):
+            for _ in get_actor_name.parse_files(files, jobs=jobs, backend=backend):
+                pass
+
+        with open(os.devnull, "w") as sink:
+            with contextlib.redirect_stdout(sink), contextlib.redirect_stderr(sink):
+                timings = _time_runs(
+                    workload,
+                    runs,
+                    warmup=warmup,
+                    disable_gc=disable_gc,
+                    before=before,
+                )
+
+        cache = "cold" if before else "warm"
+        label = f"[jobs={jobs} backend={backend} cache={cache}] "
+        reports.append(label + _format_stats(timings, runs, len(files)))
+
+    return "\n".join(reports)
+
+def run_latency_benchmark(search_path, requests=20):
+    """
+    Compares answering one decode request by spawning the CLI per request
+    against a round trip to a resident --serve process.
+    """
+    import json
+    import subprocess
+
+    search_path = os.path.abspath(search_path)
+    if os.path.isfile(search_path):
+        files = [search_path]
+    else:
+        files = glob.glob(os.path.join(search_path, "**/*.uasset"), recursive=True)
+    if not files:
+        return "No .uasset files found."
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "get_actor_name.py")
+    batch = files[:64]
+
+    spawn_ms = []
+    for i in range(requests):
+        start = time.perf_counter_ns()
+        subprocess.run([sys.executable, script] + batch, stdout=subprocess.DEVNULL, check=True)
+        spawn_ms.append((time.perf_counter_ns() - start) / 1_000_000)
+
+    daemon_ms = []
+    proc = subprocess.Popen([sys.executable, script, "--serve"], stdin=subprocess.PIPE,
+                            stdout=subprocess.PIPE, text=True, encoding="utf-8")
+    try:
+        for i in range(requests):
+            request = {"jsonrpc": "2.0", "id": i, "method": "decode", "params": {"paths": batch}}
+            start = time.perf_counter_ns()
+            proc.stdin.write(json.dumps(request) + "\n")
+            proc.stdin.flush()
+            proc.stdout.readline()
+            daemon_ms.append((time.perf_counter_ns() - start) / 1_000_000)
+    finally:
+        proc.stdin.close()
+        proc.wait()
+
+    lines = [f"Latency (ms) per request of {len(batch)} files, {requests} requests:"]
+    for name, times in (("spawn", spawn_ms), ("daemon", daemon_ms)):
+        lines.append(f"  {name:<7} first={times[0]:.3f} median={statistics.median(times):.3f} "
+                     f"min={min(times):.3f}")
+    return "\n".join(lines)
+
+def _parse_read_all(path):
+    with open(path, "rb") as f:
+        return get_actor_name._parse_uasset(f.read())
+
+def _parse_mmap(path):
+    import mmap
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        with mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as mm:
+            return get_actor_name._parse_uasset(mm, size)
+
+def run_alloc_benchmark(search_path):
+    """
+    Python heap usage per parsed file, measured with tracemalloc, for a full
+    read, the default progressive read and parsing over an mmap.
+    """
+    import tracemalloc
+
+    search_path = os.path.abspath(search_path)
+    if os.path.isfile(search_path):
+        files = [search_path]
+    else:
+        files = glob.glob(os.path.join(search_path, "**/*.uasset"), recursive=True)
+    if not files:
+        return "No .uasset files found."
+
+    modes = (("read", _parse_read_all), ("progressive", get_actor_name.parse_file),
+             ("mmap", _parse_mmap))
+    lines = [f"Heap per file (KiB), {len(files)} files:"]
+    for name, parse in modes:
+        for f in files[:8]:
+            parse(f)  # warm imports and caches outside the measurement
+        peaks = []
+        tracemalloc.start()
+        try:
+            for f in files:
+                tracemalloc.reset_peak()
+                base = tracemalloc.get_traced_memory()[0]
+                parse(f)
+                peaks.append((tracemalloc.get_traced_memory()[1] - base) / 1024)
+        finally:
+            tracemalloc.stop()
+        lines.append(f"  {name:<12} peak avg={statistics.mean(peaks):.1f} "
+                     f"median={statistics.median(peaks):.1f} max={max(peaks):.1f}")
+    return "\n".join(lines)
+
+def run_async_benchmark(search_path, concurrency=8, min_files=2000):
+    """
+    Parses the files (repeated up to min_files paths) inside an event loop,
+    once by calling the sync parse_files() from a coroutine and once through
+    aparse_files(). A ticker coroutine measures how long the loop stalls.
+    """
+    import asyncio
+
+    search_path = os.path.abspath(search_path)
+    if os.path.isfile(search_path):
+        files = [search_path]
+    else:
+        files = glob.glob(os.path.join(search_path, "**/*.uasset"), recursive=True)
+    if not files:
+        return "No .uasset files found."
+    paths = (files * -(-min_files // len(files)))[:max(min_files, len(files))]
+
+    async def sync_path():
+        for _ in get_actor_name.parse_files(paths, jobs=concurrency):
+            pass
+
+    async def async_path():
+        async for _ in get_actor_name.aparse_files(paths, concurrency):
+            pass
+
+    async def measure(workload):
+        stalls = []
+        done = asyncio.Event()
+
+        async def ticker():
+            last = time.perf_counter_ns()
+            while not done.is_set():
+                await asyncio.sleep(0.001)
+                now = time.perf_counter_ns()
+                stalls.append((now - last) / 1_000_000)
+                last = now
+
+        tick = asyncio.create_task(ticker())
+        await asyncio.sleep(0)
+        start = time.perf_counter_ns()
+        await workload()
+        elapsed = (time.perf_counter_ns() - start) / 1_000_000
+        done.set()
+        await tick
+        return elapsed, max(stalls) if stalls else 0.0
+
+    lines = [f"Event loop, {len(paths)} files, concurrency={concurrency}:"]
+    for name, workload in (("sync", sync_path), ("async", async_path)):
+        elapsed, stall = asyncio.run(measure(workload))
+        lines.append(f"  {name:<6} total={elapsed:.3f} ms"
+                     f"  files/s={len(paths) / elapsed * 1000:.0f}"
+                     f"  max loop stall={stall:.3f} ms")
+    return "\n".join(lines)
+
+PHASES = ("enumerate", "read", "header_scan", "name_map", "tag_find", "value_decode", "total")
+
+def _timer_overhead_ns(samples=2000):
+    """Median cost of an empty perf_counter_ns() pair, subtracted from each sample."""
+    clock = time.perf_counter_ns
+    costs = []
+    for _ in range(samples):
+        start = clock()
+        costs.append(clock() - start)
+    return statistics.median(costs)
+
+def _find_tag(data, size, summary, pattern):
+    """
+    (buffer, tag offset, limit) of the label tag, searched as _parse_uasset
+    does: get_actor_name._find_in_exports(), else the whole file. The tag
+    offset is -1 if it is not found.
+    """
+    if summary is not None:
+        found = get_actor_name._find_in_exports(data, size, summary, pattern, None)
+        if found is not None:
+            return found
+    return data, data.find(pattern), len(data)
+
+def _phase_inputs(path):
+    """
+    Reads a file and runs the pipeline once, keeping each phase's inputs so the
+    phases can be timed separately on identical data. None if it has no label.
+    """
+    g = get_actor_name
+    with open(path, "rb") as f:
+        data = f.read()
+    size = len(data)
+    summary = g.read_package_summary(data, size)
+    if summary is not None:
+        name_count, name_offset = summary.name_count, summary.name_offset
+        hashes = summary.file_version_ue4 >= g.VER_UE4_NAME_HASHES_SERIALIZED
+        ue5 = summary.file_version_ue5
+    else:
+        name_count, name_offset = g._scan_name_map_location(data, size)
+        hashes = ue5 = None
+    names = (data, name_offset, name_count, hashes, g._LABEL_KEYS, b"StrProperty")
+    _, label_idx, str_idx, _ = g._find_label_names(*names)
+    if label_idx < 0 or str_idx < 0:
+        return None
+    pattern = g._pack_iiii(label_idx, 0, str_idx, 0)
+    buf, tag_off, limit = _find_tag(data, size, summary, pattern)
+    if tag_off == -1:
+        return None
+    return {"path": path, "data": data, "size": size, "summary": summary, "names": names,
+            "pattern": pattern, "decode": (buf, tag_off, limit, ue5)}
+
+def _read_prefix(path):
+    fd = os.open(path, get_actor_name._O_FLAGS)
+    try:
+        return len(get_actor_name._pread(fd, get_actor_name.PROGRESSIVE_READ_BYTES, 0))
+    finally:
+        os.close(fd)
+
+def _total_bytes(path):
+    return len(get_actor_name._parse_file_progressive(path)[1])
+
+def run_phase_benchmark(search_path, runs=5, warmup=1, cold=False, ofpa_only=False):
+    """
+    Times each pipeline phase per file and returns a result dict:
+    {"meta": {...}, "phases": {phase: stats}} with times in microseconds.
+
+    enumerate is timed per walk (ops = files found). read and total (a full
+    parse_file(), reads included) are timed with the page cache warm, and
+    also cold when cold=True and the OS can drop cached pages. The CPU
+    phases run on in-memory data of the files that decode.
+    """
+    g = get_actor_name
+    search_path = os.path.abspath(search_path)
+    files = ([search_path] if os.path.isfile(search_path)
+             else _enumerate_files(search_path, True, ofpa_only))
+    if not files:
+        return None
+    inputs = [i for i in map(_phase_inputs, files) if i is not None]
+    overhead = _timer_overhead_ns()
+    clock = time.perf_counter_ns
+
+    def measure(func, args_list, evict=None):
+        """Per-call samples (us) over runs; func returns bytes processed or None."""
+        samples = []
+        total_bytes = 0
+        for run in range(warmup + runs):
+            if evict is not None:
+                evict()
+            for args in args_list:
+                start = clock()
+                n = func(*args)
+                elapsed = clock() - start
+                if run >= warmup:
+                    samples.append(max(elapsed - overhead, 0) / 1000)
+                    if n is not None:
+                        total_bytes += n
+        return samples, total_bytes
+
+    def report(samples, ops, total_bytes=None):
+        # _summarize wants ms for its per-second figures
+        stats = _summarize([t / 1000 for t in samples], ops, total_bytes)
+        for key in ("min", "p50", "p95", "p99", "max", "mean", "stdev"):
+            stats[key] *= 1000
+        return stats
+
+    phases = {}
+    walks = [(lambda: len(_enumerate_files(search_path, True, ofpa_only)),)]
+    if os.path.isdir(search_path):
+        samples, _ = measure(lambda walk: walk(), walks)
+        phases["enumerate"] = report(samples, len(files) * runs)
+
+    file_args = [(f,) for f in files]
+    evict_all = (lambda: evict_page_cache(files)) if cold and evict_page_cache(files[:1]) else None
+    for name, func in (("read", _read_prefix), ("total", _total_bytes)):
+        for suffix, evict in (("", None), ("[cold]", evict_all)):
+            if suffix and evict is None:
+                continue
+            samples, nbytes = measure(func, file_args, evict)
+            phases[name + suffix] = report(samples, len(samples), nbytes)
+
+    def header_scan(data, size):
+        if g.read_package_summary(data, size) is None:
+            g._scan_name_map_location(data, size)
+
+    cpu = (("header_scan", header_scan, [(i["data"], i["size"]) for i in inputs]),
+           ("name_map", g._find_label_names, [i["names"] for i in inputs]),
+           ("tag_find", _find_tag,
+            [(i["data"], i["size"], i["summary"], i["pattern"]) for i in inputs]),
+           ("value_decode", g._decode_label_value, [i["decode"] for i in inputs]))
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for name, func, args_list in cpu:
+            if args_list:
+                samples, _ = measure(lambda *a, func=func: func(*a) and None, args_list)
+                phases[name] = report(samples, len(samples))
+    finally:
+        if was_enabled:
+            gc.enable()
+
+    order = {name: n for n, name in enumerate(PHASES)}
+    phases = dict(sorted(phases.items(), key=lambda kv: order[kv[0].split("[")[0]]))
+    return {"meta": _bench_meta(files, inputs, runs, warmup, overhead), "phases": phases}
+
+def _bench_meta(files, inputs, runs, warmup, overhead):
+    import platform
+    import subprocess
+
+    commit = None
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        pass
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "accelerator": get_actor_name._accel is not None,
+        "files": len(files),
+        "decoded_files": len(inputs),
+        "file_bytes": sum(i["size"] for i in inputs),
+        "runs": runs,
+        "warmup": warmup,
+        "timer_overhead_ns": overhead,
+        "unit": "us",
+    }
+
+def _format_phases(result):
+    meta = result["meta"]
+    accel = "C accelerator" if meta["accelerator"] else "pure Python"
+    lines = [f"Phases (us per op), {meta['files']} files, runs={meta['runs']}, {accel}, "
+             f"commit {meta['commit'] or '?'}:",
+             f"  {'phase':<18}{'p50':>9}{'p95':>9}{'p99':>9}{'mean':>9}{'ops/s':>12}{'MB/s':>9}"]
+    for name, st in result["phases"].items():
+        mb = f"{st['bytes_per_s'] / 1e6:.1f}" if "bytes_per_s" in st else "-"
+        lines.append(f"  {name:<18}{st['p50']:>9.2f}{st['p95']:>9.2f}{st['p99']:>9.2f}"
+                     f"{st['mean']:>9.2f}{st['ops_per_s']:>12.0f}{mb:>9}")
+    return "\n".join(lines)
+
+def _format_comparison(base, new, base_name="A", new_name="B"):
+    """Side-by-side p50/p95 of two phase results; ratio < 1 means B is faster."""
+    def describe(result):
+        meta = result["meta"]
+        return (f"commit {meta.get('commit') or '?'}, "
+                f"{'C accelerator' if meta.get('accelerator') else 'pure Python'}")
+
+    lines = [f"A: {base_name} ({describe(base)})", f"B: {new_name} ({describe(new)})",
+             f"  {'phase':<18}{'A p50':>9}{'B p50':>9}{'B/A':>7}{'A p95':>9}{'B p95':>9}{'B/A':>7}"]
+    for name, a in base["phases"].items():
+        b = new["phases"].get(name)
+        if b is None:
+            continue
+        row = f"  {name:<18}"
+        for key in ("p50", "p95"):
+            ratio = b[key] / a[key] if a[key] else float("nan")
+            row += f"{a[key]:>9.2f}{b[key]:>9.2f}{ratio:>7.2f}"
+        lines.append(row)
+    return "\n".join(lines)
+
+def run_phase_command(args):
+    import json
+
+    if args.compare and len(args.compare) > 2:
+        print("Error: --compare takes one or two JSON files", file=sys.stderr)
+        return 1
+    loaded = []
+    for path in args.compare or ():
+        with open(path, encoding="utf-8") as f:
+            loaded.append((path, json.load(f)))
+    if len(loaded) == 2:
+        print(_format_comparison(loaded[0][1], loaded[1][1], loaded[0][0], loaded[1][0]))
+        return 0
+
+    result = run_phase_benchmark(args.path, args.runs, args.warmup, args.cold, args.ofpa_only)
+    if result is None:
+        print("No .uasset files found.")
+        return 1
+    if args.json == "-":
+        print(json.dumps(result, indent=2))
+    else:
+        print(_format_phases(result))
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump(result, f, indent=2)
+    if loaded:
+        print(_format_comparison(loaded[0][1], result, loaded[0][0], "this run"))
+    return 0
 
 def main():
     parser = argparse.ArgumentParser(description="Benchmark get_actor_name.py performance.")
@@ -101,8 +545,43 @@ def main():
     parser.add_argument("--warmup", type=int, default=1, help="Number of warmup runs")
     parser.add_argument("--no-gc", action="store_true", help="Disable GC during timing")
     parser.add_argument("--no-recurse", action="store_true", help="Do not search recursively")
+    parser.add_argument("--ofpa-only", action="store_true",
+                        help="Only enumerate __ExternalActors__ / __ExternalObjects__ folders")
+    parser.add_argument("--jobs", default="1",
+                        help="Comma-separated reader thread counts to compare, e.g. 1,2,4,8")
+    parser.add_argument("--cold", action="store_true",
+                        help="Drop the files from the page cache before each measured run")
+
+    parser.add_argument("--backend", choices=("thread", "process"), default="thread",
+                        help="Worker type used for jobs > 1")
+    parser.add_argument("--latency", type=int, metavar="REQUESTS",
+                        help="Compare per-process spawn vs. --serve round-trip latency")
+    parser.add_argument("--alloc", action="store_true",
+                        help="Report Python heap usage per file (tracemalloc) by read mode")
+    parser.add_argument("--phases", action="store_true",
+                        help="Time each pipeline phase per file with p50/p95/p99, ops/s and "
+                             "bytes/s (with --cold, read phases are also timed cold)")
+    parser.add_argument("--json", metavar="FILE",
+                        help="With --phases, also write the results as JSON ('-' for stdout)")
+    parser.add_argument("--compare", nargs="+", metavar="JSON",
+                        help="Compare phase results side by side: one file against a fresh "
+                             "--phases run, or two files against each other")
+    parser.add_argument("--async", dest="async_concurrency", type=int, metavar="CONCURRENCY",
+                        help="Compare aparse_files() with sync parse_files() in an event loop")
 
     args = parser.parse_args()
+    if args.latency:
+        print(run_latency_benchmark(args.path, args.latency))
+        return
+    if args.alloc:
+        print(run_alloc_benchmark(args.path))
+        return
+    if args.phases or args.compare:
+        return run_phase_command(args)
+    if args.async_concurrency:
+        print(run_async_benchmark(args.path, args.async_concurrency))
+        return
+    jobs_list = [int(j) for j in args.jobs.split(",") if j.strip()]
 
     print(
         run_benchmark(
@@ -110,10 +589,14 @@ def main():
             runs=args.runs,
             warmup=args.warmup,
             disable_gc=args.no_gc,
-            recursive=not args.no_recurse
+            recursive=not args.no_recurse,
+            jobs_list=jobs_list,
+            cold=args.cold,
+            backend=args.backend,
+            ofpa_only=args.ofpa_only,
         )
     )
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
 
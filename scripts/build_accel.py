@@ -0,0 +1,43 @@
+"""
+Builds the optional C accelerator (_uasset_accel.c) next to get_actor_name.py.
+
+    python scripts/build_accel.py
+
+Needs a C compiler and setuptools. get_actor_name.py works without the
+module; when it is present the header scan and name map walk run in C.
+Delete the built file (or set OFPA_PURE_PYTHON=1) to go back to Python.
+"""
+import os
+import sys
+import tempfile
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def build():
+    try:
+        from setuptools import Distribution, Extension
+    except ImportError:
+        print("Error: building the accelerator needs setuptools (pip install setuptools)",
+              file=sys.stderr)
+        return 1
+
+    ext = Extension("_uasset_accel", sources=[os.path.join(SCRIPTS_DIR, "_uasset_accel.c")])
+    dist = Distribution({"name": "_uasset_accel", "ext_modules": [ext]})
+    cmd = dist.get_command_obj("build_ext")
+    cmd.build_lib = SCRIPTS_DIR
+    with tempfile.TemporaryDirectory() as build_temp:
+        cmd.build_temp = build_temp
+        cmd.ensure_finalized()
+        try:
+            cmd.run()
+        except Exception as e:  # CompileError / LinkError / missing compiler
+            print(f"Error: could not build the accelerator: {e}", file=sys.stderr)
+            return 1
+    for output in cmd.get_outputs():
+        print(f"Built {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(build())
@@ -0,0 +1,377 @@
+"""
+Generates a synthetic corpus of One File Per Actor .uasset packages for
+scaling benchmarks.
+
+    python scripts/generate_corpus.py OUT --files 100000 --seed 7 \
+        --versions 5.3,5.4,5.6,5.7 --names 20-400 --size 2K-64K --utf16 0.1
+
+Every file is a complete package as the editor writes it (summary, name map,
+import/export maps, tagged actor data, package trailer) with a random actor
+label, so get_actor_name.py decodes it through its normal path. The output
+depends only on the arguments: file i is built from its own generator seeded
+with (seed, i), so --jobs and interrupted runs give identical bytes. Files go
+to OUT/Content/__ExternalActors__/Maps/Map<k>/<d1>/<d2>/<NAME>.uasset with
+the directory fan-out set by --maps and --fanout.
+"""
+import argparse
+import functools
+import hashlib
+import json
+import os
+import random
+import struct
+import sys
+import zlib
+
+MAGIC = b'\xc1\x83\x2a\x9e'
+FILE_VERSION_UE4 = 522
+LEGACY_UE3_VERSION = 864
+PACKAGE_FLAGS = 0x4040  # as saved for the sample actors (not PKG_FilterEditorOnly)
+# Engine layouts: LegacyFileVersion, FileVersionUE5, custom version count, SavedByEngineVersion
+PROFILES = {
+    '5.3': (-8, 1009, 9, (5, 3, 2, 29314046, '++UE5+Release-5.3')),
+    '5.4': (-8, 1012, 9, (5, 4, 4, 35576357, '++UE5+Release-5.4')),
+    '5.6': (-8, 1013, 11, (5, 6, 0, 36537174, '++UE5+Release-5.6')),
+    '5.7': (-9, 1017, 1, (5, 7, 0, 42667094, '++UE5+Release-5.7')),
+}
+# FPackageTrailer without payloads (header + footer), written after the package tag
+TRAILER = (struct.pack('<QiIQi', 0xD1C43B2E80A5F697, 2, 28, 0, 0)
+           + struct.pack('<QQI', 0x29BFCA045138DE76, 48, 0x9E2A83C1))
+BASE36 = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+ACTOR_CLASSES = ('StaticMeshActor', 'PointLight', 'SpotLight', 'DecalActor', 'BlockingVolume',
+                 'PlayerStart', 'CameraActor', 'TriggerBox', 'SkyLight', 'NavMeshBoundsVolume')
+LABEL_PREFIXES = ('SM', 'BP', 'PL', 'SL', 'DA', 'BV', 'Light', 'Cam', 'FX', 'Prop')
+LABEL_WORDS = ('Rock', 'Tree', 'Fence', 'House', 'Road', 'Bridge', 'Lamp', 'Crate', 'Wall',
+               'Door', 'Barrel', 'Cliff', 'Bush', 'Tower', 'Gate', 'Pillar', 'Stairs', 'Roof')
+UTF16_WORDS = ('Größe', 'Brücke', 'Château', 'Árbol', 'Дерево', 'Мост', 'ライト', '木箱',
+               'Baum_Ä', 'Zaun_ß', 'Porte_é', 'Λάμπα')
+FILLER_WORDS = ('Transform', 'Mobility', 'Material', 'Mesh', 'Collision', 'Bounds', 'Tag',
+                'Layer', 'Grid', 'Scale', 'Rotation', 'Location', 'Visible', 'Shadow',
+                'Channel', 'Profile', 'Socket', 'Override', 'Section', 'Cell')
+
+
+def _i(v):
+    return struct.pack('<i', v)
+
+
+def _fname(index, number=0):
+    return struct.pack('<ii', index, number)
+
+
+def _fstring(text):
+    """FString: ANSI when possible, else UTF-16 (negative length), NUL-terminated."""
+    if text.isascii():
+        raw = text.encode('ascii')
+        return _i(len(raw) + 1) + raw + b'\0'
+    raw = text.encode('utf-16-le')
+    return _i(-(len(raw) // 2 + 1)) + raw + b'\0\0'
+
+
+@functools.lru_cache(maxsize=65536)
+def _name_entry(name):
+    """Name map entry: FString plus a crc32 of the name filling the 4 hash bytes."""
+    return _fstring(name) + struct.pack('<I', zlib.crc32(name.encode()))
+
+
+def _guid(*parts):
+    return hashlib.md5('/'.join(map(str, parts)).encode()).digest()
+
+
+def _engine_version(version):
+    major, minor, patch, changelist, branch = version
+    return struct.pack('<HHHI', major, minor, patch, changelist) + _fstring(branch)
+
+
+def _summary(profile, f):
+    """FPackageFileSummary bytes; f holds the offsets and counts (all zero to measure)."""
+    legacy, ue5, custom_count, engine = profile
+    out = [MAGIC, _i(legacy), _i(LEGACY_UE3_VERSION), _i(FILE_VERSION_UE4)]
+    if legacy <= -8:
+        out.append(_i(ue5))
+    out.append(_i(0))  # licensee version
+    if ue5 >= 1016:
+        out += [_guid('saved', f['package']) + b'\0' * 4, _i(f['total_header_size'])]
+    out.append(_i(custom_count))
+    out += [_guid('custom', k) + _i(k + 1) for k in range(custom_count)]
+    if ue5 < 1016:
+        out.append(_i(f['total_header_size']))
+    out += [_fstring(f['package']), struct.pack('<I', PACKAGE_FLAGS),
+            _i(f['name_count']), _i(f['name_offset'])]
+    if ue5 >= 1008:
+        out += [_i(0), _i(f['import_offset'])]  # soft object paths
+    out.append(_fstring(_guid('loc', f['package']).hex().upper()))  # LocalizationId
+    out += [_i(0), _i(f['import_offset'])]  # gatherable text data
+    out += [_i(f['export_count']), _i(f['export_offset']),
+            _i(f['import_count']), _i(f['import_offset'])]
+    if ue5 >= 1015:
+        out += [_i(0), _i(f['depends_offset'])] * 2  # cell exports/imports
+    if ue5 >= 1014:
+        out.append(_i(0))  # metadata offset
+    out += [_i(f['depends_offset']),
+            _i(0), _i(f['searchable_offset']),  # soft package references
+            _i(f['searchable_offset']), _i(0)]  # searchable names, thumbnail table
+    if ue5 < 1016:
+        out.append(_guid('guid', f['package']))
+    out.append(_guid('persistent', f['package']))
+    out += [_i(1), _i(f['export_count']), _i(f['name_count'])]  # generations
+    compatible = engine[:2] + (0,) + engine[3:]
+    out += [_engine_version(engine), _engine_version(compatible)]
+    out += [_i(0), _i(0), struct.pack('<I', zlib.crc32(f['package'].encode())), _i(0)]
+    out += [_i(f['ar_offset']), struct.pack('<q', f['bulk_offset']), _i(0), _i(0),
+            _i(-1), _i(f['total_header_size']),  # preload dependencies
+            _i(f['name_count']), struct.pack('<q', f['bulk_offset'] + 4), _i(0)]
+    return b''.join(out)
+
+
+def _tag(ue5, name, type_name, value):
+    """Property tag followed by its value, in the layout of the given version."""
+    if ue5 >= 1012:
+        head = name + type_name + _i(0) + _i(len(value)) + b'\0'  # no inner types, no flags
+    else:
+        head = name + type_name + _i(len(value)) + _i(0) + b'\0'  # ArrayIndex, no guid
+        if ue5 >= 1011:
+            head += b'\0'  # no property extensions
+    return head + value
+
+
+def _export_entry(ue5, class_index, template_index, outer_index, name, serial_size,
+                  serial_offset):
+    out = [struct.pack('<iiii', class_index, 0, template_index, outer_index), name,
+           struct.pack('<Iqq', 0x8 if outer_index <= 0 else 0x280009, serial_size,
+                       serial_offset),
+           _i(0) * 3]  # bForcedExport, bNotForClient, bNotForServer
+    if ue5 < 1005:
+        out.append(b'\0' * 16)  # PackageGuid
+    if ue5 >= 1006:
+        out.append(_i(0))  # bIsInheritedInstance
+    out += [_i(0), _i(1 if outer_index <= 0 else 0), _i(0)]  # flags, NotAlwaysLoaded, IsAsset
+    if ue5 >= 1003:
+        out.append(_i(0))  # bGeneratePublicHash
+    out += [_i(-1)] + [_i(0)] * 4  # export dependencies
+    if ue5 >= 1010:
+        out.append(struct.pack('<qq', 0, serial_size))  # script serialization range
+    return b''.join(out)
+
+
+def _random_label(rng, utf16):
+    words = UTF16_WORDS if utf16 else LABEL_WORDS
+    return f"{rng.choice(LABEL_PREFIXES)}_{rng.choice(words)}{rng.randrange(1000)}"
+
+
+def build_package(rng, version, name_count, target_size, label, package, map_package):
+    """
+    Bytes of one actor package of at least name_count names (more if the
+    structure needs them), padded with component data to about target_size.
+    package is the package's own path, map_package that of its world.
+    """
+    profile = PROFILES[version]
+    ue5 = profile[1]
+    actor_class = rng.choice(ACTOR_CLASSES)
+    components = rng.randint(1, 3)
+    required = ['None', '/Script/CoreUObject', '/Script/Engine', 'Package', 'Class', 'Level',
+                'PersistentLevel', map_package, actor_class, 'Default__' + actor_class,
+                'SceneComponent', 'ActorLabel', 'StrProperty', 'RootComponent',
+                'ObjectProperty']
+    fillers = [f"{word}_{k}" for k, word in enumerate(
+        rng.choices(FILLER_WORDS, k=max(0, name_count - len(required))))]
+    names = required + fillers
+    rng.shuffle(names)
+    index = {name: k for k, name in enumerate(names)}
+    n = lambda name, number=0: _fname(index[name], number)  # noqa: E731
+
+    name_map = b''.join(map(_name_entry, names))
+    imports = [  # (ClassPackage, ClassName, OuterIndex, ObjectName)
+        ('/Script/CoreUObject', 'Package', 0, '/Script/Engine'),             # -1
+        ('/Script/CoreUObject', 'Class', -1, actor_class),                   # -2
+        ('/Script/Engine', actor_class, -1, 'Default__' + actor_class),      # -3
+        ('/Script/CoreUObject', 'Class', -1, 'SceneComponent'),              # -4
+        ('/Script/CoreUObject', 'Package', 0, map_package),                  # -5
+        ('/Script/Engine', 'Level', -5, 'PersistentLevel'),                  # -6
+    ]
+    import_map = b''.join(n(pkg) + n(cls) + _i(outer) + n(obj) + n('None') + _i(0)
+                          for pkg, cls, outer, obj in imports)
+
+    ctrl = b'\0' if ue5 >= 1011 else b''
+    actor_data = (ctrl + _tag(ue5, n('RootComponent'), n('ObjectProperty'), _i(1))
+                  + _tag(ue5, n('ActorLabel'), n('StrProperty'), _fstring(label))
+                  + n('None') + _i(0))
+    component_data = [ctrl + n('None') + _i(0) for _ in range(components)]
+
+    stride = len(_export_entry(ue5, 0, 0, 0, b'\0' * 8, 0, 0))
+    export_count = components + 1
+    f = dict.fromkeys(('total_header_size', 'name_count', 'name_offset', 'import_offset',
+                       'import_count', 'export_offset', 'export_count', 'depends_offset',
+                       'searchable_offset', 'ar_offset', 'bulk_offset'), 0)
+    f['package'] = package
+    f['name_offset'] = len(_summary(profile, f))
+    f['name_count'] = len(names)
+    f['import_offset'] = f['name_offset'] + len(name_map)
+    f['import_count'] = len(imports)
+    f['export_offset'] = f['import_offset'] + len(import_map)
+    f['export_count'] = export_count
+    f['depends_offset'] = f['export_offset'] + export_count * stride
+    f['searchable_offset'] = f['depends_offset'] + 4 * export_count
+    f['ar_offset'] = f['searchable_offset'] + 4
+    f['total_header_size'] = f['ar_offset'] + 12
+
+    fixed = (f['total_header_size'] + sum(map(len, component_data)) + len(actor_data)
+             + 4 + len(TRAILER))
+    if target_size > fixed:
+        component_data[-1] += rng.randbytes(target_size - fixed)
+
+    exports = []
+    offset = f['total_header_size']
+    for c, data in enumerate(component_data):
+        exports.append(_export_entry(ue5, -4, 0, export_count, n('SceneComponent', c + 1),
+                                     len(data), offset))
+        offset += len(data)
+    exports.append(_export_entry(ue5, -2, -3, -6, n(actor_class, rng.randrange(1, 1000)),
+                                 len(actor_data), offset))
+    f['bulk_offset'] = offset + len(actor_data)
+
+    ar_data = struct.pack('<qi', f['ar_offset'] + 12, 0)
+    return b''.join([_summary(profile, f), name_map, import_map, b''.join(exports),
+                     b'\0' * (4 * export_count), _i(0), ar_data, b''.join(component_data),
+                     actor_data, MAGIC, TRAILER])
+
+
+def _parse_range(text, scale=False):
+    """'N' or 'MIN-MAX' with optional K/M suffixes -> (min, max)."""
+    def number(s):
+        s = s.strip().upper()
+        mult = 1
+        if scale and s[-1:] in ('K', 'M'):
+            mult = 1024 if s[-1] == 'K' else 1024 * 1024
+            s = s[:-1]
+        return int(float(s) * mult)
+
+    lo, _, hi = text.partition('-')
+    lo = number(lo)
+    hi = number(hi) if hi else lo
+    if lo < 0 or hi < lo:
+        raise ValueError(f"bad range: {text}")
+    return lo, hi
+
+
+def _dir_name(value, levels):
+    """Base-36 directory name wide enough for levels distinct values."""
+    width = 1
+    while 36 ** width < levels:
+        width += 1
+    digits = []
+    for _ in range(width):
+        value, d = divmod(value, 36)
+        digits.append(BASE36[d])
+    return ''.join(reversed(digits))
+
+
+def generate_file(out_dir, seed, i, versions, names, size, utf16, fanout, maps):
+    """Builds and writes file i. Returns its manifest record."""
+    rng = random.Random(f"{seed}/{i}")
+    version = rng.choice(versions)
+    map_name = f"Map{rng.randrange(maps)}"
+    dirs = [_dir_name(rng.randrange(level), level) for level in fanout]
+    stem = ''.join(rng.choice(BASE36) for _ in range(21))
+    package = '/'.join(['/Game/__ExternalActors__/Maps', map_name] + dirs + [stem])
+    label = _random_label(rng, rng.random() < utf16)
+    data = build_package(rng, version, rng.randint(*names), rng.randint(*size), label,
+                         package, f"/Game/Maps/{map_name}")
+    rel = os.path.join('Content', '__ExternalActors__', 'Maps', map_name, *dirs,
+                       stem + '.uasset')
+    path = os.path.join(out_dir, rel)
+    try:
+        f = open(path, 'wb')
+    except FileNotFoundError:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        f = open(path, 'wb')
+    with f:
+        f.write(data)
+    return {"path": rel.replace(os.sep, '/'), "version": version, "label_type": "ActorLabel",
+            "label": label, "size": len(data)}
+
+
+def _generate_range(args):
+    out_dir, seed, start, stop, options = args
+    return [generate_file(out_dir, seed, i, **options) for i in range(start, stop)]
+
+
+def generate(out_dir, files, seed=0, versions=tuple(PROFILES), names=(20, 200),
+             size=(0, 0), utf16=0.0, fanout=(16, 16), maps=1, jobs=1, manifest=None,
+             chunk_files=1000):
+    """
+    Writes files packages under out_dir and returns how many were written.
+    manifest: optional path of a JSON Lines file listing each package's
+    relative path, version, label and size, in file order.
+    """
+    unknown = set(versions) - set(PROFILES)
+    if unknown:
+        raise ValueError(f"unknown versions: {', '.join(sorted(unknown))}")
+    options = {"versions": tuple(versions), "names": names, "size": size, "utf16": utf16,
+               "fanout": tuple(fanout), "maps": maps}
+    chunks = [(out_dir, seed, start, min(start + chunk_files, files), options)
+              for start in range(0, files, chunk_files)]
+    os.makedirs(out_dir, exist_ok=True)
+    if manifest and os.path.dirname(manifest):
+        os.makedirs(os.path.dirname(manifest), exist_ok=True)
+    out = open(manifest, 'w', encoding='utf-8') if manifest else None
+    try:
+        if jobs > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            pool = ProcessPoolExecutor(max_workers=jobs)
+            results = pool.map(_generate_range, chunks)
+        else:
+            pool = None
+            results = map(_generate_range, chunks)
+        written = 0
+        for records in results:
+            written += len(records)
+            if out is not None:
+                out.writelines(json.dumps(r, ensure_ascii=False) + '\n' for r in records)
+        if pool is not None:
+            pool.shutdown()
+        return written
+    finally:
+        if out is not None:
+            out.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate a deterministic synthetic OFPA .uasset corpus.")
+    parser.add_argument("out", help="Output directory (Content/ is created inside)")
+    parser.add_argument("--files", type=int, default=1000, help="Number of packages")
+    parser.add_argument("--seed", type=int, default=0, help="Seed; same seed, same bytes")
+    parser.add_argument("--versions", default=",".join(PROFILES),
+                        help="Comma-separated engine layouts to mix (default: %(default)s)")
+    parser.add_argument("--names", default="20-200", metavar="MIN-MAX",
+                        help="Name map length per package (default: %(default)s)")
+    parser.add_argument("--size", default="0", metavar="MIN-MAX",
+                        help="Target file size, e.g. 4K-256K; 0 keeps packages minimal")
+    parser.add_argument("--utf16", type=float, default=0.0, metavar="FRACTION",
+                        help="Share of labels with non-ASCII characters, stored as UTF-16")
+    parser.add_argument("--maps", type=int, default=1, help="Number of map folders")
+    parser.add_argument("--fanout", default="16,16", metavar="N,N",
+                        help="Folders per level below each map (default: %(default)s)")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="Worker processes")
+    parser.add_argument("--manifest", metavar="FILE",
+                        help="Write path/version/label/size of each package as JSON Lines")
+    args = parser.parse_args()
+
+    try:
+        fanout = tuple(int(n) for n in args.fanout.split(",") if n.strip())
+        if any(n < 1 for n in fanout) or args.maps < 1:
+            raise ValueError("fan-out and map counts must be >= 1")
+        count = generate(args.out, args.files, args.seed,
+                         [v.strip() for v in args.versions.split(",") if v.strip()],
+                         _parse_range(args.names), _parse_range(args.size, scale=True),
+                         args.utf16, fanout, args.maps, args.jobs, args.manifest)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(f"Generated {count} packages in {os.path.abspath(args.out)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
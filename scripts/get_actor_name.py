@@ -7,16 +7,26 @@ with hashed filenames like KCBX0GWLTFQT9RJ8M1LY8.uasset.
 Performance: ~0.07 ms/file (1733 files in ~123 ms)
 Compatibility: UE 4.26 - 5.7+
 
+Only the leading block of each file is read; further bytes are fetched on
+demand (see PROGRESSIVE_READ_BYTES), so large actors cost a fraction of a
+full read.
+
 Algorithm:
-    1. Heuristic Header Scan - locates Name Map bypassing version differences
-    2. Index-based Search - finds ActorLabel/FolderLabel and StrProperty indices
+    1. Package Summary - reads NameCount/NameOffset from FPackageFileSummary,
+       falling back to a heuristic header scan for unknown layouts
+    2. Index-based Search - looks up ActorLabel/FolderLabel and StrProperty in a
+       NameTable walked only as far as needed
     3. Pattern Matching - finds 16-byte tag [Label_Index, 0, StrProperty_Index, 0]
-    4. Value Extraction - extracts the string value following the pattern
+       inside the actor export's serial range (read on its own when needed)
+    4. Value Extraction - reads the FString through the tag layout (pre-5.4 or
+       FPropertyTypeName), falling back to a pattern search after the tag
 """
 import sys
 import struct
 import os
+import re
 import argparse
+from array import array
 
 # Configuration constants for header parsing
 HEADER_SCAN_LIMIT_BYTES = 1024
@@ -25,151 +35,773 @@ PROPERTY_TAG_VALUE_WINDOW_BYTES = 150
 FN_NAME_TYPE_HEADER_BYTES = 16
 UNREAL_ASSET_MAGIC_NUMBER = b'\xc1\x83\x2a\x9e'
 
+# Progressive reads: the summary, name map and (for most actors) the label tag
+# sit in the first few KB, so read that block first and grow only on demand.
+PROGRESSIVE_READ_BYTES = 16384
+PROGRESSIVE_READ_GROWTH = 4
+# Prefixes past this size are parsed over a read-only mmap instead of read
+MMAP_MIN_BYTES = 1 << 20
+
+# In-flight reads per worker thread for --jobs (bounds memory on huge trees)
+THREAD_QUEUE_FACTOR = 4
+# Files per work item for the process backend (amortizes pickling and IPC)
+PROCESS_CHUNK_FILES = 256
+# Files per executor job for aparse_files (amortizes event loop round trips)
+ASYNC_BATCH_FILES = 16
+# In-memory tier size of the blob OID cache (entries, ~100 bytes each)
+BLOB_CACHE_MAX_ENTRIES = 65536
+# Object names written to `git cat-file --batch` between flushes
+GIT_BATCH_FLUSH_NAMES = 64
+# Seconds GitBlobReader.close() waits for git to exit before killing it
+GIT_CLOSE_TIMEOUT = 5.0
+# Output lines per write for the buffered result writer
+OUTPUT_FLUSH_LINES = 256
+# Seconds between stat-diff polls in --watch mode
+WATCH_INTERVAL_SECONDS = 1.0
+# Read size for streaming paths from stdin
+STDIN_CHUNK_BYTES = 65536
+# Folders holding One File Per Actor packages
+OFPA_DIR_MARKERS = ('__ExternalActors__/', '__ExternalObjects__/')
+# Project folders --ofpa-only never descends into (lowercase; build output, caches)
+OFPA_SKIP_DIRS = frozenset(('binaries', 'intermediate', 'saved', 'deriveddatacache'))
+
+
+class ParseFailure(str):
+    """
+    Reason a file yielded no label. Falsy, so it can stand in for None
+    wherever results are tested with `if result:`.
+    """
+    __slots__ = ()
+
+    def __bool__(self):
+        return False
+
+
+NOT_UASSET = ParseFailure("not a .uasset package")
+NO_NAME_MAP = ParseFailure("name map not found")
+NO_LABEL_NAME = ParseFailure("no ActorLabel/FolderLabel/Label name")
+NO_LABEL_TAG = ParseFailure("label property tag not found")
+NO_LABEL_VALUE = ParseFailure("label value not found")
+GIT_OBJECT_MISSING = ParseFailure("git object missing or not a blob")
+# Prefix of failures to read the file at all; transient, so never cached
+READ_ERROR_PREFIX = "read error"
+
 # Precompiled struct functions - avoid repeated struct creation
 _unpack_int = struct.Struct('<i').unpack_from
+_unpack_ii = struct.Struct('<ii').unpack_from
+_unpack_iiii = struct.Struct('<iiii').unpack_from
+_unpack_qq = struct.Struct('<qq').unpack_from
+_unpack_IIII = struct.Struct('<IIII').unpack_from
 _pack_iiii = struct.Struct('<IIII').pack
 
+# Label value: short FString length then printable ASCII, or a UTF-16 length
+_FSTRING_CANDIDATE = re.compile(rb'[\x02-\x7f]\x00\x00\x00[\x20-\x7f]|[\x81-\xfe]\xff\xff\xff')
+# FString length (1-255) followed by a package path or "None": FolderName
+_FOLDER_NAME_CANDIDATE = re.compile(rb'[\x01-\xff]\x00\x00\x00(?=/|None)')
+
+# FPackageFileSummary versioning (ObjectVersion.h)
+VER_UE4_SERIALIZE_TEXT_IN_PACKAGES = 459
+VER_UE4_NAME_HASHES_SERIALIZED = 504
+VER_UE4_64BIT_EXPORTMAP_SERIALSIZES = 511
+VER_UE4_ADDED_PACKAGE_SUMMARY_LOCALIZATION_ID = 516
+VER_UE4_NON_OUTER_PACKAGE_IMPORT = 520
+VER_UE5_OPTIONAL_RESOURCES = 1003
+VER_UE5_REMOVE_OBJECT_EXPORT_PACKAGE_GUID = 1005
+VER_UE5_TRACK_OBJECT_EXPORT_IS_INHERITED = 1006
+VER_UE5_ADD_SOFTOBJECTPATH_LIST = 1008
+VER_UE5_METADATA_SERIALIZATION_OFFSET = 1014
+VER_UE5_VERSE_CELLS = 1015
+VER_UE5_SCRIPT_SERIALIZATION_OFFSET = 1010
+VER_UE5_PROPERTY_TAG_EXTENSION_AND_OVERRIDABLE_SERIALIZATION = 1011
+VER_UE5_PROPERTY_TAG_COMPLETE_TYPE_NAME = 1012
+VER_UE5_PACKAGE_SAVED_HASH = 1016
+PKG_FILTER_EDITOR_ONLY = 0x80000000
+CUSTOM_VERSION_ENTRY_BYTES = 20  # FGuid + int32, LegacyFileVersion <= -6
+MAX_NAME_COUNT = 100000
+# NameTable lookups answered by in-place comparison before it builds its dict
+NAME_INDEX_AFTER_LOOKUPS = 2
+
+# FPropertyTag flags (UE 5.4+ layout) and extension bits
+TAG_HAS_ARRAY_INDEX = 0x01
+TAG_HAS_PROPERTY_GUID = 0x02
+TAG_HAS_PROPERTY_EXTENSIONS = 0x04
+TAG_BOOL_TRUE = 0x10
+TAG_EXT_OVERRIDABLE_INFORMATION = 0x02
+
+# Label property names, in order of preference
+LABEL_NAMES = ((b'ActorLabel', "ActorLabel"), (b'FolderLabel', "FolderLabel"),
+               (b'Label', "Label"))
+_LABEL_KEYS = tuple(key for key, _ in LABEL_NAMES)
+
+
+class PackageSummary:
+    """
+    Fields of FPackageFileSummary needed to navigate a package, read by
+    read_package_summary(). Offsets are absolute file offsets.
+    """
+    __slots__ = ('legacy_file_version', 'file_version_ue4', 'file_version_ue5',
+                 'file_version_licensee', 'custom_version_count', 'total_header_size',
+                 'folder_name', 'package_flags', 'name_count', 'name_offset',
+                 'soft_object_paths_count', 'soft_object_paths_offset',
+                 'gatherable_text_data_count', 'gatherable_text_data_offset',
+                 'export_count', 'export_offset', 'import_count', 'import_offset',
+                 'depends_offset')
+
+    def __repr__(self):
+        fields = ", ".join(f"{k}={getattr(self, k)!r}" for k in self.__slots__)
+        return f"PackageSummary({fields})"
+
 
-def _parse_uasset(data):
+def _read_fstring(data, off):
+    """Reads an FString at off. Returns (value, end_offset) or (None, off) if malformed."""
+    n = _unpack_int(data, off)[0]
+    off += 4
+    if n > 0:
+        end = off + n
+        if n > MAX_EXPECTED_STRING_LENGTH * 4 or end > len(data):
+            return None, off
+        return data[off:end - 1].decode('utf-8', 'replace'), end
+    if n < 0:
+        end = off - 2 * n
+        if n < -MAX_EXPECTED_STRING_LENGTH * 4 or end > len(data):
+            return None, off
+        return data[off:end - 2].decode('utf-16le', 'replace'), end
+    return '', off
+
+
+def read_package_summary(data, size=None):
     """
-    Parse uasset data and extract label. Returns (label_type, label_value) or None.
+    Reads the FPackageFileSummary at the start of a .uasset, jumping straight
+    to each field according to the file's versions.
+
+    Returns a PackageSummary, or None for packages this reader does not
+    understand (pre-4.26 layouts, licensee variants, truncated data); callers
+    then fall back to the heuristic header scan.
     """
-    size = len(data)
-    if size < 20 or data[:4] != UNREAL_ASSET_MAGIC_NUMBER:
+    avail = len(data)
+    if size is None or size < avail:
+        size = avail
+    if avail < 64 or data[:4] != UNREAL_ASSET_MAGIC_NUMBER:
         return None
+    unpack = _unpack_int
+    try:
+        legacy = unpack(data, 4)[0]
+        if not -9 <= legacy <= -6:
+            return None
+        off = 12  # skips LegacyUE3Version (present unless legacy == -4)
+        ue4 = unpack(data, off)[0]
+        off += 4
+        ue5 = 0
+        if legacy <= -8:
+            ue5 = unpack(data, off)[0]
+            off += 4
+        licensee = unpack(data, off)[0]
+        off += 4
+        total_header_size = 0
+        if ue5 >= VER_UE5_PACKAGE_SAVED_HASH:
+            total_header_size = unpack(data, off + 20)[0]  # after FIoHash SavedHash
+            off += 24
+        custom_count = unpack(data, off)[0]
+        if not 0 <= custom_count < 1024:
+            return None
+        off += 4 + custom_count * CUSTOM_VERSION_ENTRY_BYTES
+        if ue5 < VER_UE5_PACKAGE_SAVED_HASH:
+            total_header_size = unpack(data, off)[0]
+            off += 4
+        folder_name, end = _read_fstring(data, off)
+        if folder_name is None:
+            return None
+        off = end
+        package_flags = unpack(data, off)[0] & 0xFFFFFFFF
+        name_count, name_offset = _unpack_ii(data, off + 4)
+        off += 12
+        soft_count = soft_offset = 0
+        if ue5 >= VER_UE5_ADD_SOFTOBJECTPATH_LIST:
+            soft_count, soft_offset = _unpack_ii(data, off)
+            off += 8
+        if (not package_flags & PKG_FILTER_EDITOR_ONLY
+                and ue4 >= VER_UE4_ADDED_PACKAGE_SUMMARY_LOCALIZATION_ID):
+            localization_id, off = _read_fstring(data, off)
+            if localization_id is None:
+                return None
+        gather_count = gather_offset = 0
+        if ue4 >= VER_UE4_SERIALIZE_TEXT_IN_PACKAGES:
+            gather_count, gather_offset = _unpack_ii(data, off)
+            off += 8
+        export_count, export_offset, import_count, import_offset = _unpack_iiii(data, off)
+        off += 16
+        if ue5 >= VER_UE5_VERSE_CELLS:
+            off += 16  # cell export/import count and offset
+        if ue5 >= VER_UE5_METADATA_SERIALIZATION_OFFSET:
+            off += 4
+        depends_offset = unpack(data, off)[0]
+    except struct.error:
+        return None
+
+    if not (0 < name_count < MAX_NAME_COUNT and 0 < name_offset < size
+            and 0 <= export_count and 0 <= export_offset < size
+            and 0 <= import_count and 0 <= import_offset < size
+            and name_offset <= total_header_size <= size):
+        return None
+
+    summary = PackageSummary()
+    summary.legacy_file_version = legacy
+    summary.file_version_ue4 = ue4
+    summary.file_version_ue5 = ue5
+    summary.file_version_licensee = licensee
+    summary.custom_version_count = custom_count
+    summary.total_header_size = total_header_size
+    summary.folder_name = folder_name
+    summary.package_flags = package_flags
+    summary.name_count = name_count
+    summary.name_offset = name_offset
+    summary.soft_object_paths_count = soft_count
+    summary.soft_object_paths_offset = soft_offset
+    summary.gatherable_text_data_count = gather_count
+    summary.gatherable_text_data_offset = gather_offset
+    summary.export_count = export_count
+    summary.export_offset = export_offset
+    summary.import_count = import_count
+    summary.import_offset = import_offset
+    summary.depends_offset = depends_offset
+    return summary
+
+
+def _export_entry_bytes(ue5):
+    """Serialized size of one FObjectExport for the given UE5 file version."""
+    n = 104  # UE4 layout with PackageGuid and the 64-bit serial size/offset
+    if ue5 >= VER_UE5_OPTIONAL_RESOURCES:
+        n += 4  # bGeneratePublicHash
+    if ue5 >= VER_UE5_REMOVE_OBJECT_EXPORT_PACKAGE_GUID:
+        n -= 16
+    if ue5 >= VER_UE5_TRACK_OBJECT_EXPORT_IS_INHERITED:
+        n += 4  # bIsInheritedInstance
+    if ue5 >= VER_UE5_SCRIPT_SERIALIZATION_OFFSET:
+        n += 16  # ScriptSerializationStart/EndOffset
+    return n
 
+
+def _top_level_exports(data, offset, count, stride, size):
+    """
+    (SerialOffset, SerialSize, ClassIndex) of exports outered to the package
+    (OuterIndex <= 0) - the actor itself, not its components - in export map
+    order.
+    """
+    ranges = []
+    for e in range(offset, offset + count * stride, stride):
+        if _unpack_int(data, e + 12)[0] <= 0:
+            serial_size, serial_offset = _unpack_qq(data, e + 28)
+            if serial_size > 0 and 0 < serial_offset and serial_offset + serial_size <= size:
+                ranges.append((serial_offset, serial_size, _unpack_int(data, e)[0]))
+    return ranges
+
+
+def _read_str_tag_value(buf, tag_off, limit, ue5):
+    """
+    Reads a StrProperty value by walking its tag: Size, ArrayIndex and
+    HasPropertyGuid before 5.4, FPropertyTypeName remainder and tag flags
+    after. Returns None if the bytes do not fit that layout.
+    """
     unpack = _unpack_int
+    if ue5 >= VER_UE5_PROPERTY_TAG_COMPLETE_TYPE_NAME:
+        inner_count, size = _unpack_ii(buf, tag_off + 16)
+        if inner_count:
+            return None
+        flags = buf[tag_off + 24]
+        pos = tag_off + 25
+        if flags & TAG_HAS_ARRAY_INDEX:
+            pos += 4
+        if flags & TAG_HAS_PROPERTY_GUID:
+            pos += 16
+        if flags & TAG_HAS_PROPERTY_EXTENSIONS:
+            pos += 6 if buf[pos] & TAG_EXT_OVERRIDABLE_INFORMATION else 1
+    else:
+        size = unpack(buf, tag_off + 16)[0]
+        pos = tag_off + 24
+        pos += 17 if buf[pos] else 1  # HasPropertyGuid
+        if ue5 >= VER_UE5_PROPERTY_TAG_EXTENSION_AND_OVERRIDABLE_SERIALIZATION:
+            pos += 6 if buf[pos] & TAG_EXT_OVERRIDABLE_INFORMATION else 1
+    if pos + size > limit:
+        return None
+    n = unpack(buf, pos)[0]
+    if n > 1 and size == n + 4:
+        return buf[pos + 4:pos + 3 + n].decode('latin-1')
+    if n < -1 and size == 4 - 2 * n:
+        return buf[pos + 4:pos + 2 - 2 * n].decode('utf-16le', errors='ignore')
+    return None
 
-    # Fast path: find '/' to locate FolderName string
-    slash_off = data.find(b'/', 20, 1024)
-    start = 20
-    if slash_off >= 24:
-        p_len = unpack(data, slash_off - 4)[0]
-        if 0 < p_len < 256:
-            start = slash_off - 4
 
-    # Scan for name_count and name_offset
-    header_len = min(size, 1024)
-    limit = header_len - 20
-    off = start
-    name_count = name_offset = 0
-
-    while off < limit:
-        p_len = unpack(data, off)[0]
-        if 0 < p_len < 256:
-            str_end = off + 4 + p_len
-            if str_end > limit:
-                break
-            ch = data[off + 4]
-            if ch == 47 or (ch == 78 and data[off+4:off+8] == b'None'):
-                base = str_end
-                if base + 12 <= header_len:
-                    nc = unpack(data, base + 4)[0]
-                    no = unpack(data, base + 8)[0]
-                    if 0 < nc < 100000 and 0 < no < size:
-                        name_count, name_offset = nc, no
-                        break
-        off += 1
+def _search_label_value(buf, i, end):
+    """
+    Layout-free fallback: the first FString in buf[i:end], found by the
+    precompiled candidate pattern and checked for printable ASCII.
+    """
+    search = _FSTRING_CANDIDATE.search
+    while True:
+        m = search(buf, i, end)
+        if m is None:
+            return None
+        i = m.start()
+        p_len = _unpack_int(buf, i)[0]
+        if p_len > 0:
+            str_end = i + 3 + p_len
+            if str_end <= end:
+                val = buf[i+4:str_end]
+                # Printable ASCII check; min() runs in C, unlike a generator
+                if val.isascii() and min(val) > 31:
+                    return val.decode('ascii')
+        else:
+            str_end = i + 2 - 2 * p_len
+            if str_end <= end:
+                return buf[i+4:str_end].decode('utf-16le', errors='ignore')
+        i += 1
 
-    if not name_count:
+
+def _decode_label_value(buf, tag_off, limit, ue5=None):
+    """
+    Value of the StrProperty whose tag starts at tag_off, reading no further
+    than limit. Uses the tag layout when the UE5 version is known, otherwise
+    (or if that fails) searches the PROPERTY_TAG_VALUE_WINDOW_BYTES after it.
+    """
+    if ue5 is not None:
+        try:
+            value = _read_str_tag_value(buf, tag_off, limit, ue5)
+        except (struct.error, IndexError):
+            value = None
+        if value is not None:
+            return value
+    i = tag_off + 16
+    return _search_label_value(buf, i, min(i + PROPERTY_TAG_VALUE_WINDOW_BYTES, limit))
+
+
+def _find_in_exports(data, size, summary, pattern, read_at):
+    """
+    Searches for the label tag only inside the top-level exports' serialized
+    data. Returns (buffer, tag offset, end of the export in buffer), an int
+    (prefix bytes needed), or None when the exports do not settle it.
+    """
+    if summary.file_version_ue4 < VER_UE4_64BIT_EXPORTMAP_SERIALSIZES:
         return None
+    stride = _export_entry_bytes(summary.file_version_ue5)
+    count = summary.export_count
+    map_end = summary.export_offset + count * stride
+    avail = len(data)
+    if map_end > avail:
+        return map_end if map_end <= size else None
+    for serial_offset, serial_size, _ in _top_level_exports(
+            data, summary.export_offset, count, stride, size):
+        end = serial_offset + serial_size
+        if end <= avail:
+            buf, start = data, serial_offset
+        elif read_at is not None:
+            buf, start = read_at(serial_offset, serial_size), 0
+            end = len(buf)
+        else:
+            return end
+        tag_off = buf.find(pattern, start, end)
+        if tag_off != -1:
+            return buf, tag_off, end
+    return None
 
-    # Parse Name Map - find target indices with inline matching
-    pos = name_offset
-    label_idx = str_idx = -1
-    label_type = None
 
-    i = 0
-    while i < name_count and pos + 4 <= size:
-        s_len = unpack(data, pos)[0]
-        pos += 4
+def _scan_name_map_location_py(data, size):
+    """
+    Heuristic fallback for read_package_summary(): finds NameCount/NameOffset
+    after the FolderName FString. Returns (0, 0) if not found.
+    """
+    header_len = min(len(data), HEADER_SCAN_LIMIT_BYTES)
+    limit = header_len - 20
+    # The regex engine finds the candidates; Python only validates them
+    for m in _FOLDER_NAME_CANDIDATE.finditer(data, 20, limit):
+        off = m.start()
+        base = off + 4 + data[off]
+        if base <= limit and base + 12 <= header_len:
+            nc, no = _unpack_ii(data, base + 4)
+            if 0 < nc < MAX_NAME_COUNT and 0 < no < size:
+                return nc, no
+    return 0, 0
+
+
+class NameTable:
+    """
+    Package name map as entry offsets into the original buffer. Entries are
+    walked only as far as lookups need, compared in place and decoded on
+    access; after a few lookups the walked entries are indexed in a dict, so
+    repeated queries on one file are cheap.
+
+    Keys are the raw serialized bytes: Latin-1 for ANSI entries, UTF-16LE
+    for wide ones. find() accepts either bytes (ANSI) or str.
+    """
+    __slots__ = ('data', 'count', 'hashes', '_offsets', '_index', '_indexed', '_pos',
+                 '_lookups')
+
+    def __init__(self, data, offset, count, hashes=True):
+        """
+        hashes: True if each entry is followed by its 4-byte hash pair (UE4.12+),
+        None to detect per entry (headers located by the heuristic scan).
+        """
+        self.data = data
+        self.count = count
+        self.hashes = hashes
+        self._offsets = array('i')  # position of each entry's length field
+        self._index = {}
+        self._indexed = 0  # entries [0, _indexed) are in _index
+        self._pos = offset
+        self._lookups = 0
+
+    def __len__(self):
+        return self.count
 
-        if s_len > 0:
-            end = pos + s_len
-            if end > size:
+    @property
+    def complete(self):
+        """True once every entry is located (False if the data ends early)."""
+        self._walk(self.count)
+        return len(self._offsets) == self.count
+
+    def _walk(self, upto, key=b''):
+        """
+        Locates entries up to index upto, stopping early at an entry equal to
+        key. Only entries of the key's length are compared.
+        """
+        data = self.data
+        avail = len(data)
+        unpack = _unpack_int
+        offsets = self._offsets
+        hashes = self.hashes
+        pos = self._pos
+        i = len(offsets)
+        stop = min(upto, self.count)
+        ansi_len = len(key) + 1 if key else 0
+        wide_len = -(len(key) // 2 + 1) if key and not len(key) & 1 else 0
+        while i < stop and pos + 4 <= avail:
+            s_len = unpack(data, pos)[0]
+            end = pos + 4 + (s_len if s_len > 0 else -s_len << 1)
+            if end > avail or s_len == 0:
                 break
-            # Inline target matching - avoid dict lookups
-            if s_len == 11 and label_idx < 0:
-                if data[pos:pos+10] == b'ActorLabel':
-                    label_idx, label_type = i, "ActorLabel"
-            elif s_len == 12:
-                cand = data[pos:pos+11]
-                if cand == b'StrProperty':
-                    str_idx = i
-                elif label_idx < 0 and cand == b'FolderLabel':
-                    label_idx, label_type = i, "FolderLabel"
-            elif s_len == 6 and label_idx < 0:
-                if data[pos:pos+5] == b'Label':
-                    label_idx, label_type = i, "Label"
+            offsets.append(pos)
+            entry = pos
             pos = end
-            if label_idx >= 0 and str_idx >= 0:
-                break
-        elif s_len < 0:
-            pos += (-s_len) << 1
-
-        if pos + 4 <= size:
-            nv = unpack(data, pos)[0]
-            if nv == 0 or nv < -512 or nv > 512:
+            if hashes:
                 pos += 4
-        i += 1
+            elif hashes is None and pos + 4 <= avail:
+                nv = unpack(data, pos)[0]
+                if nv == 0 or nv < -512 or nv > 512:
+                    pos += 4
+            i += 1
+            # Compared in place: find() bounded to the entry allocates nothing
+            if s_len == ansi_len or s_len == wide_len:
+                if data.find(key, entry + 4, entry + 4 + len(key)) == entry + 4:
+                    break
+        self._pos = pos
+
+    def _matches(self, i, key):
+        """Entry i equals key, compared in place."""
+        pos = self._offsets[i]
+        n = _unpack_int(self.data, pos)[0]
+        if (n - 1 if n > 0 else -2 * n - 2) != len(key):
+            return False
+        return self.data.find(key, pos + 4, pos + 4 + len(key)) == pos + 4
+
+    def find(self, name):
+        """Index of name in the map, or -1."""
+        if name.__class__ is str:
+            try:
+                idx = self.find(name.encode('latin-1'))
+            except UnicodeEncodeError:
+                idx = -1
+            return idx if idx >= 0 else self.find(name.encode('utf-16le'))
+        index = self._index
+        idx = index.get(name)
+        if idx is not None:
+            return idx
+        offsets = self._offsets
+        walked = len(offsets)
+        if self._indexed < walked:
+            if self._lookups < NAME_INDEX_AFTER_LOOKUPS:
+                for i in range(self._indexed, walked):
+                    if self._matches(i, name):
+                        return i
+            else:
+                raw = self.raw
+                for i in range(self._indexed, walked):
+                    index.setdefault(raw(i), i)
+                self._indexed = walked
+                idx = index.get(name)
+                if idx is not None:
+                    return idx
+        self._lookups += 1
+        self._walk(self.count, name)
+        if len(offsets) > walked and self._matches(len(offsets) - 1, name):
+            return len(offsets) - 1
+        return -1
+
+    def __contains__(self, name):
+        return self.find(name) >= 0
+
+    def raw(self, i):
+        """Serialized bytes of entry i without the terminator."""
+        if i >= len(self._offsets):
+            self._walk(i + 1)
+        pos = self._offsets[i]
+        n = _unpack_int(self.data, pos)[0]
+        return self.data[pos + 4:pos + 3 + n] if n > 0 else self.data[pos + 4:pos + 2 - 2 * n]
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError("name index out of range")
+        if i >= len(self._offsets):
+            self._walk(i + 1)
+            if i >= len(self._offsets):
+                raise IndexError("name map truncated")
+        raw = self.raw(i)
+        if _unpack_int(self.data, self._offsets[i])[0] > 0:
+            return raw.decode('latin-1')
+        return raw.decode('utf-16le')
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield self[i]
+
+
+def read_name_table(data, size=None):
+    """NameTable for a package (summary first, heuristic scan as fallback), or None."""
+    summary = read_package_summary(data, size)
+    if summary is not None:
+        return NameTable(data, summary.name_offset, summary.name_count,
+                         summary.file_version_ue4 >= VER_UE4_NAME_HASHES_SERIALIZED)
+    count, offset = _scan_name_map_location(data, size or len(data))
+    return NameTable(data, offset, count, None) if count else None
+
+
+def _find_label_names_py(data, offset, count, hashes, label_keys, type_key):
+    """
+    Name map indices of the most preferred label key present and of type_key.
+    Returns (choice, label_index, type_index, truncated): choice is the
+    position in label_keys (-1 if none) and truncated is True when a name
+    is missing and the map ends before count entries.
+    """
+    table = NameTable(data, offset, count, hashes)
+    choice = label_idx = -1
+    for k, key in enumerate(label_keys):
+        label_idx = table.find(key)
+        if label_idx >= 0:
+            choice = k
+            break
+    type_idx = table.find(type_key)
+    truncated = (label_idx < 0 or type_idx < 0) and not table.complete
+    return choice, label_idx, type_idx, truncated
+
+
+# Optional C versions of the two loops above (scripts/_uasset_accel.c, built
+# by scripts/build_accel.py); OFPA_PURE_PYTHON=1 forces the Python ones.
+try:
+    if os.environ.get('OFPA_PURE_PYTHON'):
+        raise ImportError
+    import _uasset_accel as _accel
+except ImportError:
+    _accel = None
+
+if _accel is not None:
+    _find_label_names = _accel.find_label_names
+
+    def _scan_name_map_location(data, size):
+        return _accel.scan_name_map_location(data, size, HEADER_SCAN_LIMIT_BYTES,
+                                             MAX_NAME_COUNT)
+else:
+    _find_label_names = _find_label_names_py
+    _scan_name_map_location = _scan_name_map_location_py
+
+
+def _parse_uasset(data, size=None, read_at=None):
+    """
+    Parse uasset data and extract label. Returns (label_type, label_value) or a
+    ParseFailure.
+
+    ``data`` may be bytes or a read-only mmap; comparisons are made in place.
+    It may be a leading part of the file when ``size`` (the full file size)
+    is given. If the answer lies past the available bytes, the number of leading
+    bytes needed to continue is returned instead (an int). ``read_at(offset,
+    count)``, if given, fetches the actor export's bytes directly instead.
+    """
+    avail = len(data)
+    if size is None or size < avail:
+        size = avail
+    if avail < 20 or data[:4] != UNREAL_ASSET_MAGIC_NUMBER:
+        return NOT_UASSET
+    if avail < size and avail < HEADER_SCAN_LIMIT_BYTES:
+        return min(size, HEADER_SCAN_LIMIT_BYTES)
+
+    summary = read_package_summary(data, size)
+    if summary is not None:
+        name_count, name_offset = summary.name_count, summary.name_offset
+    else:
+        name_count, name_offset = _scan_name_map_location(data, size)
+    if not name_count:
+        return NO_NAME_MAP
+
+    # Look up target indices, walking the name map only as far as needed
+    hashes = (summary.file_version_ue4 >= VER_UE4_NAME_HASHES_SERIALIZED
+              if summary is not None else None)
+    choice, label_idx, str_idx, truncated = _find_label_names(
+        data, name_offset, name_count, hashes, _LABEL_KEYS, b'StrProperty')
 
     if label_idx < 0 or str_idx < 0:
-        return None
+        if avail < size and truncated:
+            return avail + 1
+        return NO_LABEL_NAME
+    label_type = LABEL_NAMES[choice][1]
 
-    # Find property tag pattern
+    # Find property tag pattern, inside the actor export when the map is known
     pattern = _pack_iiii(label_idx, 0, str_idx, 0)
+    if summary is not None:
+        found = _find_in_exports(data, size, summary, pattern, read_at)
+        if found is not None:
+            if found.__class__ is int:
+                return found
+            value = _decode_label_value(*found, summary.file_version_ue5)
+            return (label_type, value) if value is not None else NO_LABEL_VALUE
     tag_off = data.find(pattern)
     if tag_off == -1:
-        return None
+        return avail + 1 if avail < size else NO_LABEL_TAG
 
-    # Extract string value - simplified loop
-    i = tag_off + 16
-    end = min(i + 150, size)
+    # Extract string value
+    end = min(tag_off + 16 + PROPERTY_TAG_VALUE_WINDOW_BYTES, size)
+    if end > avail:
+        return end
+    value = _decode_label_value(data, tag_off, avail,
+                                summary.file_version_ue5 if summary is not None else None)
+    if value is not None:
+        return (label_type, value)
+    return NO_LABEL_VALUE
 
-    while i < end - 4:
-        p_len = unpack(data, i)[0]
 
-        if 0 < p_len < 128:
-            str_end = i + 4 + p_len - 1
-            if str_end <= end:
-                val = data[i+4:str_end]
-                # Fast printable ASCII check
-                if val and val.isascii() and all(c > 31 for c in val):
-                    return (label_type, val.decode('ascii'))
-        elif -128 < p_len < 0:
-            str_end = i + 4 + ((-p_len) << 1) - 2
-            if str_end <= end:
-                val = data[i+4:str_end]
-                if val:
-                    return (label_type, val.decode('utf-16le', errors='ignore'))
-        i += 1
-
-    return None
+_O_FLAGS = os.O_RDONLY | getattr(os, 'O_BINARY', 0)
+_os_pread = getattr(os, 'pread', None)
 
+def _read_upto(fd, count):
+    """Read up to count bytes, looping over short reads (network shares)."""
+    data = os.read(fd, count)
+    if len(data) < count and data:
+        parts = [data]
+        count -= len(data)
+        while count > 0:
+            chunk = os.read(fd, count)
+            if not chunk:
+                break
+            parts.append(chunk)
+            count -= len(chunk)
+        data = b''.join(parts)
+    return data
 
-_O_FLAGS = os.O_RDONLY | getattr(os, 'O_BINARY', 0)
 
 def _read_file_fast(path):
-    """Fast file read using low-level os functions."""
+    """Fast file read using low-level os functions. Raises OSError."""
     fd = -1
     try:
         fd = os.open(path, _O_FLAGS)
         file_size = os.fstat(fd).st_size
-        return os.read(fd, file_size)
-    except OSError:
-        return b''
+        return _read_upto(fd, file_size)
     finally:
         if fd >= 0:
             os.close(fd)
 
 
-def parse_file(path):
+def _pread(fd, count, offset):
+    """Positioned read of up to count bytes (lseek + read where pread is missing)."""
+    if _os_pread is None:
+        os.lseek(fd, offset, os.SEEK_SET)
+        return _read_upto(fd, count)
+    data = _os_pread(fd, count, offset)
+    if len(data) < count and data:
+        parts = [data]
+        got = len(data)
+        while got < count:
+            chunk = _os_pread(fd, count - got, offset + got)
+            if not chunk:
+                break
+            parts.append(chunk)
+            got += len(chunk)
+        data = b''.join(parts)
+    return data
+
+
+def _parse_mapped(fd, size, parse):
+    """
+    Runs parse over a read-only mmap of the whole file. The parsers only
+    slice out the final strings, so nothing else is copied to the heap.
+    Returns None if the file cannot be mapped.
+    """
+    import mmap
+    try:
+        mm = mmap.mmap(fd, size, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    with mm:
+        return parse(mm, size, None)
+
+
+def _parse_file_progressive(path, parse=None):
+    """
+    Read only as much of the file as parsing needs.
+    Returns (result, data) where data is the prefix that was read.
+
+    parse(data, size, read_at) defaults to _parse_uasset and follows its
+    protocol: an int result asks for that many leading bytes. Once that
+    would reach MMAP_MIN_BYTES the whole file is mapped instead, so large
+    fallback searches run in place rather than on a heap copy.
+
+    Starts with PROGRESSIVE_READ_BYTES and grows geometrically while the
+    parser asks for more, which ends in a full read if the tag is not found.
+    An actor export past the prefix is read on its own with a positioned read.
+    """
+    fd = -1
+    try:
+        fd = os.open(path, _O_FLAGS)
+        size = os.fstat(fd).st_size
+        data = _read_upto(fd, min(size, PROGRESSIVE_READ_BYTES))
+
+        def read_at(offset, count):
+            return _pread(fd, count, offset)
+
+        if parse is None:
+            parse = _parse_uasset
+        while True:
+            result = parse(data, size, read_at)
+            if result.__class__ is not int:
+                return result, data
+            want = min(size, max(result, len(data) * PROGRESSIVE_READ_GROWTH))
+            if want >= MMAP_MIN_BYTES:
+                result = _parse_mapped(fd, size, parse)
+                if result is not None:
+                    return result, data
+            chunk = _pread(fd, want - len(data), len(data))
+            if len(chunk) < want - len(data):
+                size = len(data) + len(chunk)  # file shrank while reading
+            data += chunk
+    except OSError as e:
+        return ParseFailure(f"{READ_ERROR_PREFIX}: {e.strerror}"), b''
+    finally:
+        if fd >= 0:
+            os.close(fd)
+
+
+def _parse_path(path):
+    """parse_file() that keeps the ParseFailure reason."""
+    return _parse_file_progressive(path)[0]
+
+
+def parse_file(path, cache=None):
     """
     Fast single-function API for parsing uasset files.
     Returns (label_type, label_value) or None.
+
+    cache: optional LabelCache or BlobLabelCache consulted before parsing.
     """
-    data = _read_file_fast(path)
-    return _parse_uasset(data)
+    if cache is not None:
+        return cache.parse(path) or None
+    return _parse_file_progressive(path)[0] or None
 
 
 class UAssetParser:
@@ -178,37 +810,1893 @@ class UAssetParser:
 
     def __init__(self, file_path):
         self.error = None
-        self._result = None
-        self.data = _read_file_fast(file_path)
+        self._result, self.data = _parse_file_progressive(file_path)
 
     def close(self):
         pass
 
     def parse_name_map(self):
-        self._result = _parse_uasset(self.data)
-        return self._result is not None
+        return bool(self._result)
 
     def extract_label_property(self):
-        return self._result
+        return self._result or None
+
 
+# Pseudo-property naming the actor export's class (not a serialized property)
+ACTOR_CLASS = 'ActorClass'
+# Classes of top-level exports that are package bookkeeping, not the actor
+_METADATA_CLASSES = ('MetaData', 'PackageMetaData')
+# Property types extract_properties() decodes, by type name
+_DECODED_TYPES = ('StrProperty', 'NameProperty', 'BoolProperty', 'StructProperty',
+                  'ObjectProperty', 'ArrayProperty')
+# Pre-5.4 tag types followed by one extra FName (enum, inner or value type)
+_TYPES_WITH_FNAME = ('ByteProperty', 'EnumProperty', 'ArrayProperty', 'SetProperty',
+                     'OptionalProperty')
 
-def process_path(target_path, show_path=False, show_type=False):
+
+class _PackageView:
+    """Name, import and export tables of one package, for resolving tag values."""
+    __slots__ = ('data', 'summary', 'names', 'import_stride', 'export_stride', '_types')
+
+    def __init__(self, data, summary, names):
+        self.data = data
+        self.summary = summary
+        self.names = names
+        ue4, ue5 = summary.file_version_ue4, summary.file_version_ue5
+        stride = 28  # ClassPackage, ClassName, OuterIndex, ObjectName
+        if (ue4 >= VER_UE4_NON_OUTER_PACKAGE_IMPORT
+                and not summary.package_flags & PKG_FILTER_EDITOR_ONLY):
+            stride += 8  # PackageName
+        if ue5 >= VER_UE5_OPTIONAL_RESOURCES:
+            stride += 4  # bImportOptional
+        self.import_stride = stride
+        self.export_stride = _export_entry_bytes(ue5)
+        self._types = None
+
+    def type_indices(self):
+        """Name index -> type name for the property types this package uses."""
+        if self._types is None:
+            find = self.names.find
+            self._types = {}
+            for name in ('None',) + _DECODED_TYPES + _TYPES_WITH_FNAME + ('MapProperty', 'Guid'):
+                idx = find(name)
+                if idx >= 0:
+                    self._types[idx] = name
+        return self._types
+
+    def fname(self, buf, off):
+        """FName at off as text (number suffix included)."""
+        idx, number = _unpack_ii(buf, off)
+        name = self.names[idx]
+        return f"{name}_{number - 1}" if number else name
+
+    def object_path(self, index):
+        """Path of an import (index < 0) or export (index > 0), or None for null."""
+        data, s = self.data, self.summary
+        parts = []
+        while index:
+            if index < 0:
+                entry = s.import_offset + (-index - 1) * self.import_stride
+                parts.append(self.fname(data, entry + 20))
+                index = _unpack_int(data, entry + 16)[0]
+            else:
+                entry = s.export_offset + (index - 1) * self.export_stride
+                parts.append(self.fname(data, entry + 16))
+                index = _unpack_int(data, entry + 12)[0]
+                if not index:
+                    parts.append(s.folder_name)
+            if len(parts) > 64:
+                return None
+        if not parts:
+            return None
+        parts.reverse()
+        path = parts[0]
+        for i, part in enumerate(parts[1:], 1):
+            path += ('.' if i == 1 else ':') + part
+        return path
+
+
+def _format_guid(buf, off):
+    return '%08X%08X%08X%08X' % _unpack_IIII(buf, off)
+
+
+def _decode_tag_value(view, buf, pos, type_name, inner, bool_value):
+    """Decodes one property value; None for types this reader does not handle."""
+    if type_name == 'StrProperty':
+        return _read_fstring(buf, pos)[0]
+    if type_name == 'NameProperty':
+        return view.fname(buf, pos)
+    if type_name == 'BoolProperty':
+        return bool(bool_value)
+    if type_name == 'StructProperty':
+        return _format_guid(buf, pos) if inner == 'Guid' else None
+    if type_name == 'ObjectProperty':
+        return view.object_path(_unpack_int(buf, pos)[0])
+    if type_name == 'ArrayProperty':
+        count = _unpack_int(buf, pos)[0]
+        pos += 4
+        if inner == 'ObjectProperty':
+            return [view.object_path(_unpack_int(buf, pos + 4 * i)[0]) for i in range(count)]
+        if inner == 'NameProperty':
+            return [view.fname(buf, pos + 8 * i) for i in range(count)]
+        if inner == 'StrProperty':
+            values = []
+            for _ in range(count):
+                value, pos = _read_fstring(buf, pos)
+                values.append(value)
+            return values
+    return None
+
+
+def _read_tagged_properties(view, buf, pos, end, wanted, out):
     """
-    Recursively processes a file or directory.
+    Walks the tagged properties in buf[pos:end] once, decoding the names in
+    wanted into out. Stops at the None terminator or once all are found.
+    """
+    ue5 = view.summary.file_version_ue5
+    complete_type_names = ue5 >= VER_UE5_PROPERTY_TAG_COMPLETE_TYPE_NAME
+    has_extensions = ue5 >= VER_UE5_PROPERTY_TAG_EXTENSION_AND_OVERRIDABLE_SERIALIZATION
+    types = view.type_indices()
+    names = view.names
+    unpack = _unpack_int
+    if has_extensions:
+        control = buf[pos]  # EClassSerializationControlExtension
+        pos += 2 if control & TAG_EXT_OVERRIDABLE_INFORMATION else 1
+    remaining = len(wanted)
+    while pos + 8 <= end and remaining:
+        name_idx, name_number = _unpack_ii(buf, pos)
+        if name_number == 0 and types.get(name_idx) == 'None':
+            break
+        pos += 8
+        inner = None
+        bool_value = 0
+        array_index = 0
+        if complete_type_names:
+            # FPropertyTypeName: (FName, InnerCount) nodes in depth-first order
+            type_idx, pending = unpack(buf, pos)[0], unpack(buf, pos + 8)[0]
+            pos += 12
+            if pending:
+                inner = types.get(unpack(buf, pos)[0])
+            while pending:
+                pending += unpack(buf, pos + 8)[0] - 1
+                pos += 12
+            size = unpack(buf, pos)[0]
+            flags = buf[pos + 4]
+            pos += 5
+            if flags & TAG_HAS_ARRAY_INDEX:
+                array_index = unpack(buf, pos)[0]
+                pos += 4
+            if flags & TAG_HAS_PROPERTY_GUID:
+                pos += 16
+            if flags & TAG_HAS_PROPERTY_EXTENSIONS:
+                ext = buf[pos]
+                pos += 6 if ext & TAG_EXT_OVERRIDABLE_INFORMATION else 1
+            bool_value = flags & TAG_BOOL_TRUE
+        else:
+            type_idx = unpack(buf, pos)[0]
+            size, array_index = _unpack_ii(buf, pos + 8)
+            pos += 16
+            type_name = types.get(type_idx)
+            if type_name == 'StructProperty':
+                inner = types.get(unpack(buf, pos)[0])
+                pos += 24  # StructName, StructGuid
+            elif type_name == 'BoolProperty':
+                bool_value = buf[pos]
+                pos += 1
+            elif type_name in _TYPES_WITH_FNAME:
+                inner = types.get(unpack(buf, pos)[0])
+                pos += 8
+            elif type_name == 'MapProperty':
+                pos += 16
+            pos += 17 if buf[pos] else 1  # HasPropertyGuid
+            if has_extensions:
+                ext = buf[pos]
+                pos += 6 if ext & TAG_EXT_OVERRIDABLE_INFORMATION else 1
+        if size < 0 or pos + size > end:
+            break
+        if array_index == 0:
+            name = names[name_idx]
+            if name_number:
+                name = f"{name}_{name_number - 1}"
+            if name in wanted and name not in out:
+                value = _decode_tag_value(view, buf, pos, types.get(type_idx), inner, bool_value)
+                if value is not None:
+                    out[name] = value
+                    remaining -= 1
+        pos += size
+    return out
+
+
+def extract_properties(data, names, size=None, read_at=None):
+    """
+    Decodes several actor properties in one pass: one name map walk and one
+    bounded scan of the actor export's tagged properties.
+
+    names: property names (e.g. ActorLabel, RuntimeGrid, HLODLayer,
+    DataLayerAssets, bIsSpatiallyLoaded, FolderGuid), plus ACTOR_CLASS for
+    the path of the actor's class (the generated class for Blueprints).
+
+    Returns {name: value} for the requested properties that are serialized;
+    properties left at their defaults are not saved and so are absent.
+    Values are str for Str/Name/Object (object path) and Struct Guid (32 hex
+    digits), bool for Bool, and lists for arrays of those. Like _parse_uasset,
+    returns an int when data is a prefix that needs more bytes, or a
+    ParseFailure.
+    """
+    avail = len(data)
+    if size is None or size < avail:
+        size = avail
+    if avail < 20 or data[:4] != UNREAL_ASSET_MAGIC_NUMBER:
+        return NOT_UASSET
+    summary = read_package_summary(data, size)
+    if summary is None:
+        return min(size, avail * PROGRESSIVE_READ_GROWTH) if avail < size else NO_NAME_MAP
+    if avail < summary.total_header_size:
+        return summary.total_header_size
+    table = NameTable(data, summary.name_offset, summary.name_count,
+                      summary.file_version_ue4 >= VER_UE4_NAME_HASHES_SERIALIZED)
+    view = _PackageView(data, summary, table)
+    wanted = set(names)
+    out = {}
+    for serial_offset, serial_size, class_index in _top_level_exports(
+            data, summary.export_offset, summary.export_count, view.export_stride, size):
+        class_path = view.object_path(class_index)
+        if class_path is not None and class_path.rpartition('.')[2] in _METADATA_CLASSES:
+            continue
+        if ACTOR_CLASS in wanted:
+            out[ACTOR_CLASS] = class_path
+            wanted.discard(ACTOR_CLASS)
+        end = serial_offset + serial_size
+        if end <= avail:
+            buf, pos = data, serial_offset
+        elif read_at is not None:
+            buf, pos = read_at(serial_offset, serial_size), 0
+            end = len(buf)
+        else:
+            return end
+        if wanted:
+            try:
+                _read_tagged_properties(view, buf, pos, end, wanted, out)
+            except (struct.error, IndexError):
+                pass
+        break
+    return out
+
+
+def parse_file_properties(path, names):
+    """
+    extract_properties() for a file, reading only the package header and the
+    actor export. Returns a dict, or a ParseFailure.
+    """
+    def parse(data, size, read_at):
+        return extract_properties(data, names, size, read_at)
+
+    return _parse_file_progressive(path, parse)[0]
+
+
+def default_cache_path():
+    """Per-user location of the label cache database."""
+    base = (os.environ.get('LOCALAPPDATA') or os.environ.get('XDG_CACHE_HOME')
+            or os.path.join(os.path.expanduser('~'), '.cache'))
+    return os.path.join(base, 'ofpa', 'labels.sqlite')
+
+
+_CACHE_MISS = object()
+
+
+def _result_row(result):
+    """(label_type, label) columns for a result; failures keep their reason as label."""
+    if result:
+        return result
+    return None, str(result) if result is not None else None
+
+
+def _row_result(label_type, label):
+    if label_type is not None:
+        return (label_type, label)
+    return ParseFailure(label or "no label")
+
+
+def _connect_cache_db(db_path, readonly=False):
+    """
+    Opens the shared cache database, creating its tables if needed.
+    Returns None when opening read-only and the database does not exist yet.
+    """
+    import sqlite3
+
+    if readonly:
+        if not os.path.exists(db_path):
+            return None
+        from urllib.request import pathname2url
+        return sqlite3.connect(f"file:{pathname2url(db_path)}?mode=ro",
+                               uri=True, timeout=30, check_same_thread=False)
+    parent = os.path.dirname(db_path)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+    except sqlite3.DatabaseError:
+        pass  # e.g. network shares without shared memory support
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS labels (path TEXT PRIMARY KEY, size INTEGER, "
+        "mtime_ns INTEGER, inode INTEGER, label_type TEXT, label TEXT) WITHOUT ROWID")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS blobs (oid TEXT PRIMARY KEY, label_type TEXT, "
+        "label TEXT) WITHOUT ROWID")
+    conn.commit()
+    return conn
+
+
+class LabelCache:
+    """
+    Persistent label cache (sqlite) keyed by absolute path and validated by
+    (size, mtime_ns, inode), so unchanged files are never parsed twice.
+
+    Lookups are thread-safe. New entries are buffered and written in one
+    transaction by flush()/close(); sqlite locking makes concurrent writers
+    safe. Files without a label are cached too.
+    """
+    __slots__ = ('path', 'hits', 'misses', '_conn', '_pending', '_lock', '_readonly')
+
+    def __init__(self, db_path, readonly=False):
+        import threading
+
+        self.path = db_path
+        self.hits = self.misses = 0
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._readonly = readonly
+        self._conn = _connect_cache_db(db_path, readonly)
+
+    def lookup(self, path):
+        """
+        Returns (key, result). result is _CACHE_MISS when the file must be parsed;
+        key is the (size, mtime_ns, inode) to store with it, or None if stat failed.
+        """
+        path = os.path.abspath(path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None, _CACHE_MISS
+        key = (st.st_size, st.st_mtime_ns, st.st_ino)
+        with self._lock:
+            row = self._pending.get(path)
+            if row is None and self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT size, mtime_ns, inode, label_type, label FROM labels WHERE path = ?",
+                    (path,)).fetchone()
+            if row is not None and tuple(row[:3]) == key:
+                self.hits += 1
+                return key, _row_result(row[3], row[4])
+            self.misses += 1
+        return key, _CACHE_MISS
+
+    def store(self, path, key, result):
+        """Records a parse result; read errors are skipped, the next run retries them."""
+        if result.__class__ is ParseFailure and result.startswith(READ_ERROR_PREFIX):
+            return
+        label_type, label = _result_row(result)
+        with self._lock:
+            self._pending[os.path.abspath(path)] = key + (label_type, label)
+
+    def resolve(self, path):
+        """
+        Returns (key, result, hit), parsing on a miss without storing it.
+        """
+        key, result = self.lookup(path)
+        if result is _CACHE_MISS:
+            return key, _parse_path(path), False
+        return key, result, True
+
+    def parse(self, path):
+        """parse_file() through the cache."""
+        key, result, hit = self.resolve(path)
+        if not hit and key is not None:
+            self.store(path, key, result)
+        return result
+
+    def flush(self):
+        with self._lock:
+            if not self._pending or self._readonly:
+                return
+            rows = [(p,) + row for p, row in self._pending.items()]
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO labels VALUES (?, ?, ?, ?, ?, ?)", rows)
+            self._pending.clear()
+
+    def close(self):
+        if self._conn is not None:
+            self.flush()
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def git_blob_oid(data, hash_name='sha1'):
+    """Git object ID of data stored as a blob (hash_name='sha256' for SHA-256 repos)."""
+    import hashlib
+
+    h = hashlib.new(hash_name, b'blob %d\0' % len(data))
+    h.update(data)
+    return h.hexdigest()
+
+
+class BlobLabelCache:
+    """
+    Content-addressed label cache keyed by git blob OID, so the same actor
+    content is decoded once regardless of path, branch or checkout.
+
+    An LRU-bounded in-memory tier sits in front of an optional persistent
+    tier (the blobs table of the cache database). Blob labels never go stale,
+    so persistent entries need no validation.
+    """
+    __slots__ = ('path', 'hits', 'misses', 'max_entries', 'hash_name',
+                 '_lru', '_pending', '_conn', '_lock', '_readonly')
+
+    def __init__(self, db_path=None, max_entries=BLOB_CACHE_MAX_ENTRIES, hash_name='sha1',
+                 readonly=False):
+        import threading
+        from collections import OrderedDict
+
+        self.path = db_path
+        self.hits = self.misses = 0
+        self.max_entries = max_entries
+        self.hash_name = hash_name
+        self._lru = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._readonly = readonly
+        self._conn = _connect_cache_db(db_path, readonly) if db_path else None
+
+    def get(self, oid):
+        """Returns the cached result for oid, or _CACHE_MISS."""
+        with self._lock:
+            lru = self._lru
+            result = lru.get(oid, _CACHE_MISS)
+            if result is not _CACHE_MISS:
+                lru.move_to_end(oid)
+                self.hits += 1
+                return result
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT label_type, label FROM blobs WHERE oid = ?", (oid,)).fetchone()
+                if row is not None:
+                    result = _row_result(row[0], row[1])
+                    self._remember(oid, result)
+                    self.hits += 1
+                    return result
+            self.misses += 1
+        return _CACHE_MISS
+
+    def put(self, oid, result):
+        with self._lock:
+            self._remember(oid, result)
+            if self._conn is not None and not self._readonly:
+                self._pending[oid] = result
+
+    def _remember(self, oid, result):
+        lru = self._lru
+        lru[oid] = result
+        lru.move_to_end(oid)
+        if len(lru) > self.max_entries:
+            lru.popitem(last=False)
+
+    def parse_blob(self, data, oid=None):
+        """_parse_uasset() through the cache; oid is computed when not supplied."""
+        if oid is None:
+            oid = git_blob_oid(data, self.hash_name)
+        result = self.get(oid)
+        if result is _CACHE_MISS:
+            result = _parse_uasset(data)
+            self.put(oid, result)
+        return result
+
+    def resolve(self, path, oid=None):
+        """
+        Returns (oid, result, hit), parsing on a miss without storing it.
+
+        A supplied oid is looked up before the file is read at all. On a miss
+        the oid returned is always that of the content actually read (the
+        file may differ from the blob the caller expected), and None when the
+        file could not be read or is empty, so no result is cached for it.
+        """
+        if oid is not None:
+            result = self.get(oid)
+            if result is not _CACHE_MISS:
+                return oid, result, True
+        try:
+            data = _read_file_fast(path)
+        except OSError as e:
+            return None, ParseFailure(f"{READ_ERROR_PREFIX}: {e.strerror}"), False
+        if not data:
+            return None, _parse_uasset(data), False
+        actual = git_blob_oid(data, self.hash_name)
+        if actual != oid:
+            result = self.get(actual)
+            if result is not _CACHE_MISS:
+                return actual, result, True
+        return actual, _parse_uasset(data), False
+
+    def store(self, path, oid, result):
+        self.put(oid, result)
+
+    def parse(self, path, oid=None):
+        """parse_file() through the cache."""
+        oid, result, hit = self.resolve(path, oid)
+        if not hit and oid is not None:
+            self.put(oid, result)
+        return result
+
+    def flush(self):
+        with self._lock:
+            if not self._pending:
+                return
+            rows = [(oid,) + _result_row(r) for oid, r in self._pending.items()]
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO blobs VALUES (?, ?, ?)", rows)
+            self._pending.clear()
+
+    def close(self):
+        if self._conn is not None:
+            self.flush()
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def default_index_path():
+    """Per-user location of the reverse label index database."""
+    return os.path.join(os.path.dirname(default_cache_path()), 'index.sqlite')
+
+
+def _path_range(root):
+    """(low, high) bounds of the paths under directory root in sort order."""
+    prefix = os.path.join(os.path.abspath(root), '')
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class LabelIndex:
+    """
+    Persistent reverse index (sqlite) of label -> paths and path -> label for
+    whole Content trees.
+
+    update() scans a tree once and afterwards only re-parses files whose
+    (size, mtime_ns) changed, dropping rows of deleted files. Labels are
+    indexed case-insensitively for exact and prefix lookups; substring
+    lookups use an FTS5 trigram index where sqlite provides one (and a
+    LIKE scan otherwise, or for queries shorter than three characters).
+    """
+    __slots__ = ('path', '_conn', '_fts')
+
+    def __init__(self, db_path):
+        import sqlite3
+
+        self.path = db_path
+        parent = os.path.dirname(db_path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        conn = self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+        except sqlite3.DatabaseError:
+            pass
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS actors (id INTEGER PRIMARY KEY, path TEXT UNIQUE, "
+            "size INTEGER, mtime_ns INTEGER, label_type TEXT, label TEXT COLLATE NOCASE)")
+        conn.execute("CREATE INDEX IF NOT EXISTS actors_label ON actors (label)")
+        try:
+            conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS actors_fts USING fts5(label, "
+                "content='actors', content_rowid='id', tokenize='trigram')")
+            conn.executescript("""
+                CREATE TRIGGER IF NOT EXISTS actors_ai AFTER INSERT ON actors BEGIN
+                    INSERT INTO actors_fts(rowid, label) VALUES (new.id, new.label);
+                END;
+                CREATE TRIGGER IF NOT EXISTS actors_ad AFTER DELETE ON actors BEGIN
+                    INSERT INTO actors_fts(actors_fts, rowid, label)
+                    VALUES ('delete', old.id, old.label);
+                END;
+                CREATE TRIGGER IF NOT EXISTS actors_au AFTER UPDATE OF label ON actors BEGIN
+                    INSERT INTO actors_fts(actors_fts, rowid, label)
+                    VALUES ('delete', old.id, old.label);
+                    INSERT INTO actors_fts(rowid, label) VALUES (new.id, new.label);
+                END;
+            """)
+            self._fts = True
+        except sqlite3.OperationalError:
+            self._fts = False  # sqlite built without FTS5 or the trigram tokenizer
+        conn.commit()
+
+    def update(self, root, jobs=1, ofpa_only=False):
+        """
+        Brings the entries under root up to date.
+        Returns (added, changed, removed) file counts.
+        """
+        known = {}
+        if os.path.isdir(root):
+            low, high = _path_range(root)
+            for path, size, mtime_ns in self._conn.execute(
+                    "SELECT path, size, mtime_ns FROM actors WHERE path >= ? AND path < ?",
+                    (low, high)):
+                known[path] = (size, mtime_ns)
+        else:
+            root = os.path.abspath(root)
+            row = self._conn.execute(
+                "SELECT size, mtime_ns FROM actors WHERE path = ?", (root,)).fetchone()
+            if row is not None:
+                known[root] = tuple(row)
+
+        stale = {}
+        added = changed = 0
+        for path in _iter_uasset_files(root, ofpa_only):
+            path = os.path.abspath(path)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            key = (st.st_size, st.st_mtime_ns)
+            old = known.pop(path, None)
+            if old != key:
+                stale[path] = key
+                if old is None:
+                    added += 1
+                else:
+                    changed += 1
+
+        rows = [(path,) + stale[path] + (result or (None, None))
+                for path, result in parse_files(stale, jobs=jobs)]
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO actors (path, size, mtime_ns, label_type, label) "
+                "VALUES (?, ?, ?, ?, ?) ON CONFLICT(path) DO UPDATE SET size = excluded.size, "
+                "mtime_ns = excluded.mtime_ns, label_type = excluded.label_type, "
+                "label = excluded.label", rows)
+            self._conn.executemany("DELETE FROM actors WHERE path = ?",
+                                   [(path,) for path in known])
+        return added, changed, len(known)
+
+    def find(self, text, match='exact', under=None, limit=None):
+        """
+        Returns [(path, (label_type, label))] for labels equal to, starting
+        with (match='prefix') or containing (match='substring') text,
+        ignoring ASCII case. under restricts results to one directory.
+        """
+        sql = "SELECT path, label_type, label FROM actors WHERE "
+        if match == 'exact':
+            sql += "label = ?"
+            args = [text]
+        elif match == 'prefix':
+            sql += "label >= ? AND label < ?"
+            args = [text, text + '\U0010ffff']
+        elif match == 'substring':
+            if self._fts and len(text) >= 3:
+                sql += "id IN (SELECT rowid FROM actors_fts WHERE actors_fts MATCH ?)"
+                args = ['"' + text.replace('"', '""') + '"']
+            else:
+                escaped = text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+                sql += "label LIKE ? ESCAPE '\\'"
+                args = ['%' + escaped + '%']
+        else:
+            raise ValueError(f"unknown match: {match!r}")
+        if under is not None:
+            sql += " AND path >= ? AND path < ?"
+            args.extend(_path_range(under))
+        sql += " ORDER BY label, path"
+        if limit is not None:
+            sql += " LIMIT ?"
+            args.append(limit)
+        return [(path, (label_type, label))
+                for path, label_type, label in self._conn.execute(sql, args)]
+
+    def label(self, path):
+        """The indexed (label_type, label) of a file, or None."""
+        row = self._conn.execute(
+            "SELECT label_type, label FROM actors WHERE path = ?",
+            (os.path.abspath(path),)).fetchone()
+        return tuple(row) if row is not None and row[1] is not None else None
+
+    def __len__(self):
+        return self._conn.execute(
+            "SELECT COUNT(*) FROM actors WHERE label IS NOT NULL").fetchone()[0]
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class GitBlobReader:
+    """
+    Streams objects out of a repository through one long-lived
+    `git cat-file --batch` process, so historical blobs are decoded
+    without checkouts or temp files.
+
+    Object names are anything cat-file accepts: blob OIDs, "rev:path", ...
+    """
+    __slots__ = ('repo', '_proc')
+
+    def __init__(self, repo='.', git='git'):
+        import subprocess
+
+        self.repo = repo
+        self._proc = subprocess.Popen(
+            [git, '-C', repo, 'cat-file', '--batch'],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+
+    def _read_object(self):
+        """Reads one response. Returns (oid, type, data); oid is None if missing."""
+        stdout = self._proc.stdout
+        header = stdout.readline()
+        if not header:
+            raise OSError(f"git cat-file exited unexpectedly in {self.repo}")
+        parts = header.split()
+        if len(parts) != 3 or not parts[2].isdigit():  # "<name> missing" / "ambiguous"
+            return None, None, None
+        size = int(parts[2])
+        data = stdout.read(size)
+        stdout.read(1)  # trailing LF
+        return parts[0].decode('ascii'), parts[1], data
+
+    def read(self, name):
+        """Returns (oid, data) for one blob, or (None, None) if it does not exist."""
+        stdin = self._proc.stdin
+        stdin.write(name.encode('utf-8') + b'\n')
+        stdin.flush()
+        oid, obj_type, data = self._read_object()
+        if obj_type != b'blob':
+            return None, None
+        return oid, data
+
+    def iter_blobs(self, names, on_flush=None):
+        """
+        Yields (name, oid, data) for every name, pipelined: a writer thread
+        feeds names while responses are read, so git never waits on us.
+        Missing objects and non-blobs yield (name, None, None).
+
+        A name of None is a flush point (e.g. the input went idle): the
+        names before it are sent to git at once, and on_flush is called on
+        the consumer thread after their objects have been yielded.
+        """
+        import threading
+        import queue
+
+        order = queue.SimpleQueue()
+        done = object()
+        stdin = self._proc.stdin
+
+        def feed():
+            try:
+                count = 0
+                for name in names:
+                    order.put(name)
+                    if name is None:
+                        stdin.flush()
+                        continue
+                    stdin.write(name.encode('utf-8') + b'\n')
+                    count += 1
+                    if count % GIT_BATCH_FLUSH_NAMES == 0:
+                        stdin.flush()
+                stdin.flush()
+            except (OSError, ValueError):
+                pass  # git exited or the reader was closed early
+            finally:
+                order.put(done)
+
+        writer = threading.Thread(target=feed, daemon=True)
+        writer.start()
+        while True:
+            name = order.get()
+            if name is done:
+                break
+            if name is None:
+                if on_flush is not None:
+                    on_flush()
+                continue
+            oid, obj_type, data = self._read_object()
+            if obj_type != b'blob':
+                yield name, None, None
+            else:
+                yield name, oid, data
+        writer.join()
+
+    def close(self):
+        """
+        Stops git. stdout is closed first: if iteration stopped early, git may
+        be blocked writing unread objects, and would never see stdin's EOF.
+        """
+        import subprocess
+
+        proc = self._proc
+        if proc is not None:
+            self._proc = None
+            proc.stdout.close()
+            try:
+                proc.stdin.close()
+            except (OSError, ValueError):
+                pass  # git already gone (broken pipe)
+            try:
+                proc.wait(GIT_CLOSE_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def decode_git_objects(names, repo='.', cache=None, reader=None, on_flush=None):
+    """
+    Yields (name, result) for git object names (blob OIDs, "rev:path", ...),
+    streaming blobs from the object database. With a BlobLabelCache, known
+    blobs are not parsed again. A long-lived GitBlobReader may be passed in
+    to reuse its process; otherwise one is started for this call.
+    None names are flush points, see GitBlobReader.iter_blobs().
+    """
+    if reader is None:
+        with GitBlobReader(repo) as reader:
+            yield from decode_git_objects(names, repo, cache, reader, on_flush)
+        return
+    for name, oid, data in reader.iter_blobs(names, on_flush):
+        if data is None:
+            yield name, GIT_OBJECT_MISSING
+        elif cache is not None:
+            yield name, cache.parse_blob(data, oid)
+        else:
+            yield name, _parse_uasset(data)
+
+
+_NULL_OID_CHARS = frozenset('0')
+
+
+def is_ofpa_path(path):
+    """True for .uasset files under __ExternalActors__ / __ExternalObjects__."""
+    path = path.replace('\\', '/')
+    return (path[-7:].lower() == '.uasset'
+            and any(marker in path for marker in OFPA_DIR_MARKERS))
+
+
+def _decode_git_path(raw):
+    return raw.decode('utf-8', 'surrogateescape')
+
+
+def _parse_git_status_v2(data):
+    """
+    Parses `git status --porcelain=v2 -z` output.
+    Yields (status, path, old_path, old_object, in_worktree); old_object is
+    the HEAD blob OID (stage 2, "ours", for unmerged files) or None for new
+    files.
+    """
+    tokens = iter(data.split(b'\0'))
+    for token in tokens:
+        kind = token[:2]
+        if kind == b'1 ':
+            fields = token.split(b' ', 8)
+            xy, old_oid, path = fields[1].decode(), fields[6].decode(), fields[8]
+            old_path = path
+        elif kind == b'2 ':
+            fields = token.split(b' ', 9)
+            xy, old_oid, path = fields[1].decode(), fields[6].decode(), fields[9]
+            old_path = next(tokens, path)
+        elif kind == b'u ':
+            fields = token.split(b' ', 10)
+            xy, old_oid, path = fields[1].decode(), fields[8].decode(), fields[10]  # h2 (ours)
+            old_path = path
+        elif kind == b'? ':
+            path = _decode_git_path(token[2:])
+            yield '?', path, path, None, True
+            continue
+        else:  # headers, ignored files, trailing empty token
+            continue
+        status = xy[1] if xy[1] != '.' else xy[0]
+        in_worktree = xy[1] != 'D' and xy != 'D.'
+        if set(old_oid) <= _NULL_OID_CHARS:
+            old_oid = None
+        yield (status, _decode_git_path(path), _decode_git_path(old_path), old_oid,
+               in_worktree)
+
+
+def _parse_git_diff(data, old_rev='HEAD', new_rev=None):
+    """
+    Parses `git diff -z` output in --raw or --name-status form.
+    Yields (status, path, old_path, old_object, new_object); objects are git
+    object names, new_object is None when the new side is the working tree
+    (or deleted) and old_object is None for added files. Name-status input
+    has no OIDs, so the old side is read from old_rev and the new side from
+    new_rev (None: the working tree).
+    """
+    tokens = iter(data.split(b'\0'))
+    for token in tokens:
+        if not token:
+            continue
+        old_object = new_object = None
+        if token[:1] == b':':
+            meta = token[1:].decode().split()
+            status = meta[4][0]
+            if not set(meta[2]) <= _NULL_OID_CHARS:
+                old_object = meta[2]
+            if not set(meta[3]) <= _NULL_OID_CHARS:
+                new_object = meta[3]
+        else:
+            status = token[:1].decode()
+        path = old_path = _decode_git_path(next(tokens, b''))
+        if status in 'RC':
+            path = _decode_git_path(next(tokens, b''))
+        if token[:1] != b':':
+            if status not in 'A?':
+                old_object = f"{old_rev}:{old_path}"
+            if new_rev is not None and status != 'D':
+                new_object = f"{new_rev}:{path}"
+        yield status, path, old_path, old_object, new_object
+
+
+def _git_output(repo, args):
+    import subprocess
+
+    return subprocess.run(['git', '-C', repo] + args, check=True,
+                          stdout=subprocess.PIPE).stdout
+
+
+def decode_git_changes(changes, repo='.', cache=None, jobs=1):
+    """
+    Decodes both sides of changed OFPA files in one batched pass.
+
+    changes: iterable of (status, path, old_path, old_object, new_side) where
+    new_side is a git object name, True for the working tree file or None
+    for deletions. Non-OFPA paths are skipped, so only the changed set is
+    ever touched. Yields (status, path, old_result, new_result).
+    """
+    changes = [c for c in changes if is_ofpa_path(c[1]) or is_ofpa_path(c[2])]
+    if not changes:
+        return
+
+    names = []
+    for _, _, _, old_object, new_side in changes:
+        if old_object:
+            names.append(old_object)
+        if new_side and new_side is not True:
+            names.append(new_side)
+    blobs = dict(decode_git_objects(names, repo, cache)) if names else {}
+
+    root = _decode_git_path(_git_output(repo, ['rev-parse', '--show-toplevel']).rstrip(b'\n'))
+    disk = [os.path.join(root, c[1]) for c in changes if c[4] is True]
+    parse = _parse_path if cache is None else cache.parse
+    if jobs > 1:
+        on_disk = dict(_map_threaded(parse, disk, jobs))
+    else:
+        on_disk = {p: parse(p) for p in disk}
+
+    for status, path, _, old_object, new_side in changes:
+        old = blobs.get(old_object) if old_object else None
+        if new_side is True:
+            new = on_disk[os.path.join(root, path)]
+        else:
+            new = blobs.get(new_side) if new_side else None
+        yield status, path, old, new
+
+
+def process_git_changes(mode, revs=(), repo='.', show_type=False, cache=None, jobs=1,
+                        out=None, old_rev='HEAD', new_rev=None):
+    """
+    Prints labels for OFPA files changed in `git status` (mode 'status') or
+    `git diff` (mode 'diff', revs passed through). revs == ['-'] reads the
+    -z output of those commands from stdin instead of running git; for
+    `git diff --name-status` input, old_rev and new_rev name the trees the
+    two sides are read from (new_rev None: the working tree).
+    """
+    import subprocess
+
+    from_stdin = list(revs) == ['-']
+    if out is None:
+        out = _LineWriter(sys.stdout)
+    try:
+        if mode == 'status':
+            data = (sys.stdin.buffer.read() if from_stdin else _git_output(
+                repo, ['status', '--porcelain=v2', '-z', '--untracked-files=all']))
+            changes = [(st, path, old_path, old_oid, True if in_wt else None)
+                       for st, path, old_path, old_oid, in_wt in _parse_git_status_v2(data)]
+        else:
+            data = (sys.stdin.buffer.read() if from_stdin else _git_output(
+                repo, ['diff', '--raw', '-z', '--no-abbrev', '-M'] + list(revs)))
+            changes = [(st, path, old_path, old_obj,
+                        None if st == 'D' else (new_obj or True))
+                       for st, path, old_path, old_obj, new_obj
+                       in _parse_git_diff(data, old_rev, new_rev)]
+
+        for status, path, old, new in decode_git_changes(changes, repo, cache, jobs):
+            out.emit_change(status, path, old, new, show_type)
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+    finally:
+        out.flush()
+
+
+class LabelServer:
+    """
+    Resident decoder answering JSON-RPC 2.0 requests, one JSON object per line.
+    Keeps the interpreter, caches and cat-file processes warm between requests,
+    so clients pay a pipe round trip instead of a process spawn per refresh.
+
+    Methods:
+        decode          {"paths": [...]}  files or directories
+        decode_objects  {"names": [...], "repo": "."}  git object names
+        stats           cache hit/miss counts
+        shutdown
+    Each decode result is {"path"|"name", "label_type", "label"} (null labels
+    when nothing was found).
+    """
+    __slots__ = ('cache', 'blob_cache', '_readers', '_lock', '_stopped')
+
+    def __init__(self, cache=None, blob_cache=None):
+        import threading
+
+        self.cache = cache if cache is not None else LabelCache(':memory:')
+        self.blob_cache = blob_cache if blob_cache is not None else BlobLabelCache()
+        self._readers = {}
+        self._lock = threading.Lock()
+        self._stopped = False
+
+    def _decode(self, paths):
+        out = []
+        for path in paths:
+            files = _iter_uasset_files(path) if os.path.isdir(path) else (path,)
+            for f in files:
+                result = self.cache.parse(f)
+                out.append({"path": f, "label_type": result[0] if result else None,
+                            "label": result[1] if result else None})
+        self.cache.flush()
+        return out
+
+    def _decode_objects(self, names, repo='.'):
+        out = []
+        try:
+            reader = self._readers.get(repo)
+            if reader is None:
+                reader = self._readers[repo] = GitBlobReader(repo)
+            for name, result in decode_git_objects(names, repo, self.blob_cache, reader):
+                out.append({"name": name, "label_type": result[0] if result else None,
+                            "label": result[1] if result else None})
+        except OSError:
+            # git failed to start or died: the next request starts a fresh reader
+            reader = self._readers.pop(repo, None)
+            if reader is not None:
+                reader.close()
+            raise
+        finally:
+            self.blob_cache.flush()
+        return out
+
+    def handle(self, request):
+        """Returns the JSON-RPC response dict for a request dict (None for notifications)."""
+        req_id = request.get("id") if isinstance(request, dict) else None
+        try:
+            if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+                return _rpc_error(req_id, -32600, "Invalid Request")
+            method = request["method"]
+            params = request.get("params") or {}
+            with self._lock:
+                if method == "decode":
+                    result = self._decode(_rpc_param(params, "paths", list))
+                elif method == "decode_objects":
+                    result = self._decode_objects(_rpc_param(params, "names", list),
+                                                  _rpc_param(params, "repo", str, "."))
+                elif method == "stats":
+                    result = {"hits": self.cache.hits + self.blob_cache.hits,
+                              "misses": self.cache.misses + self.blob_cache.misses}
+                elif method == "shutdown":
+                    self._stopped = True
+                    result = None
+                else:
+                    return _rpc_error(req_id, -32601, f"Method not found: {method}")
+        except (KeyError, TypeError) as e:
+            return _rpc_error(req_id, -32602, f"Invalid params: {e}")
+        except OSError as e:
+            return _rpc_error(req_id, -32000, str(e))
+        if "id" not in request:
+            return None
+        return {"jsonrpc": "2.0", "id": req_id, "result": result}
+
+    def serve_stream(self, rfile, wfile):
+        """Serves line-delimited requests from rfile until EOF or shutdown."""
+        import json
+
+        for line in rfile:
+            if not line.strip():
+                continue
+            try:
+                response = self.handle(json.loads(line))
+            except ValueError:
+                response = _rpc_error(None, -32700, "Parse error")
+            if response is not None:
+                wfile.write(json.dumps(response, ensure_ascii=False) + "\n")
+                wfile.flush()
+            if self._stopped:
+                break
+
+    def serve_unix(self, socket_path):
+        """
+        Serves clients on a Unix domain socket until a shutdown request.
+        Unix only (needs socket.AF_UNIX).
+        """
+        import socketserver
+
+        server_ref = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                rfile = self.connection.makefile('r', encoding='utf-8')
+                wfile = self.connection.makefile('w', encoding='utf-8')
+                server_ref.serve_stream(rfile, wfile)
+                if server_ref._stopped:
+                    import threading
+                    threading.Thread(target=self.server.shutdown, daemon=True).start()
+
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        with socketserver.ThreadingUnixStreamServer(socket_path, Handler) as server:
+            server.daemon_threads = True
+            try:
+                server.serve_forever()
+            finally:
+                os.unlink(socket_path)
+
+    def close(self):
+        for reader in self._readers.values():
+            reader.close()
+        self._readers.clear()
+        self.cache.close()
+        self.blob_cache.close()
+
+
+def _rpc_error(req_id, code, message):
+    return {"jsonrpc": "2.0", "id": req_id, "error": {"code": code, "message": message}}
+
+
+def _rpc_param(params, key, kind, default=None):
+    """
+    params[key] checked against kind (str, or list for a list of str).
+    Raises KeyError/TypeError, which handle() reports as Invalid params.
+    """
+    if not isinstance(params, dict):
+        raise TypeError("params must be an object")
+    value = params[key] if default is None else params.get(key, default)
+    if not isinstance(value, kind) or (
+            kind is list and not all(isinstance(v, str) for v in value)):
+        what = "a list of strings" if kind is list else "a string"
+        raise TypeError(f"'{key}' must be {what}")
+    return value
+
+
+def _scan_uasset_entries(root, ofpa_only=False):
+    """
+    Yields the os.DirEntry of each .uasset file under directory root in
+    os.walk order (files of a directory before its subdirectories, symlinked
+    directories not followed).
+
+    Uses os.scandir so the DirEntry type info saves a stat per entry. With
+    ofpa_only, only files inside __ExternalActors__ / __ExternalObjects__ are
+    yielded; the regular asset folders of each Content directory and the
+    build output folders (OFPA_SKIP_DIRS) are never entered.
+    """
+    norm = os.path.abspath(root).replace('\\', '/') + '/'
+    inside = any(f"/{marker}" in norm for marker in OFPA_DIR_MARKERS)
+    markers = {marker[:-1].lower() for marker in OFPA_DIR_MARKERS}
+    # (path, inside an OFPA folder, is a Content folder)
+    stack = [(root, inside, os.path.basename(norm[:-1]).lower() == 'content')]
+    while stack:
+        path, inside, content = stack.pop()
+        subdirs = []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    name = entry.name
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if not is_dir:
+                        if (not ofpa_only or inside) and name[-7:].lower() == '.uasset':
+                            yield entry
+                        continue
+                    if entry.is_symlink():
+                        continue
+                    if ofpa_only and not inside:
+                        lower = name.lower()
+                        if lower in markers:
+                            subdirs.append((entry.path, True, False))
+                        elif not content and lower not in OFPA_SKIP_DIRS and name[0] != '.':
+                            subdirs.append((entry.path, False, lower == 'content'))
+                    else:
+                        subdirs.append((entry.path, inside, False))
+        except OSError:
+            continue  # unreadable directory, like os.walk without onerror
+        stack.extend(reversed(subdirs))
+
+
+def _scan_uasset_tree(root, ofpa_only=False):
+    """_scan_uasset_entries() as paths."""
+    for entry in _scan_uasset_entries(root, ofpa_only):
+        yield entry.path
+
+
+def _iter_uasset_files(target_path, ofpa_only=False):
+    """
+    Yields .uasset files under a file or directory path, in os.walk order.
     """
     if os.path.isdir(target_path):
-        for root, _, files in os.walk(target_path):
-            for file in files:
-                if file.lower().endswith(".uasset"):
-                    full_path = os.path.join(root, file)
-                    process_single_file(full_path, show_path, show_type)
+        yield from _scan_uasset_tree(target_path, ofpa_only)
     elif os.path.isfile(target_path):
-        process_single_file(target_path, show_path, show_type)
+        yield target_path
     else:
         print(f"Error: Path not found: {target_path}", file=sys.stderr)
 
 
-def process_single_file(file_path, show_path=False, show_type=False):
+class LabelWatcher:
+    """
+    Polling change detector for --watch: each poll() re-walks the roots,
+    diffs (size, mtime_ns, inode) against the previous walk and re-parses
+    only created or modified files.
+
+    poll() returns event dicts: "added" (new labeled file), "relabeled"
+    (label changed, old_label set) and "removed" (labeled file gone or no
+    longer labeled). The first poll reports every labeled file as added.
+    Unchanged files cost one stat per poll (none on Windows, where scandir
+    returns stat data).
+    """
+    __slots__ = ('roots', 'ofpa_only', 'jobs', 'cache', '_stats', '_labels')
+
+    def __init__(self, roots, ofpa_only=False, jobs=1, cache=None):
+        self.roots = [os.path.abspath(root) for root in roots]
+        self.ofpa_only = ofpa_only
+        self.jobs = jobs
+        self.cache = cache
+        self._stats = {}
+        self._labels = {}
+
+    def _walk(self, old_stats):
+        """
+        Returns the current {path: (size, mtime_ns, inode)} of all watched
+        files and the paths that are new or differ from old_stats.
+        """
+        stats = {}
+        stale = []
+        for root in self.roots:
+            if os.path.isdir(root):
+                entries = _scan_uasset_entries(root, self.ofpa_only)
+                found = ((entry.path, entry) for entry in entries)
+            else:
+                found = ((root, None),)
+            for path, entry in found:
+                try:
+                    st = entry.stat() if entry is not None else os.stat(path)
+                except OSError:
+                    continue
+                key = stats[path] = (st.st_size, st.st_mtime_ns, st.st_ino)
+                if old_stats.get(path) != key:
+                    stale.append(path)
+        return stats, stale
+
+    def poll(self):
+        old_stats = self._stats
+        stats, stale = self._walk(old_stats)
+        self._stats = stats
+        labels = self._labels
+        events = []
+        for path in old_stats.keys() - stats.keys():
+            old = labels.pop(path, None)
+            if old:
+                events.append({"event": "removed", "path": path, "label_type": old[0],
+                               "label": None, "old_label": old[1]})
+        for path, result in parse_files(stale, jobs=self.jobs, cache=self.cache):
+            old = labels.get(path)
+            if result:
+                labels[path] = result
+                if not old:
+                    events.append({"event": "added", "path": path, "label_type": result[0],
+                                   "label": result[1], "old_label": None})
+                elif old != result:
+                    events.append({"event": "relabeled", "path": path,
+                                   "label_type": result[0], "label": result[1],
+                                   "old_label": old[1]})
+            elif old:
+                del labels[path]
+                events.append({"event": "removed", "path": path, "label_type": old[0],
+                               "label": None, "old_label": old[1]})
+        if self.cache is not None:
+            self.cache.flush()
+        return events
+
+    def __len__(self):
+        return len(self._labels)
+
+
+def _imap_pool(pool, func, items, window, ordered=True):
+    """
+    Yields (item, func(item)) from an executor with at most window calls in flight.
+    With ordered=False results stream as they complete. An item of None is a
+    flush point: every pending result is yielded before the next item is taken.
+    """
+    from concurrent.futures import wait, FIRST_COMPLETED
+    from collections import deque
+
+    if ordered:
+        pending = deque()
+        for item in items:
+            if item is None:
+                while pending:
+                    item, future = pending.popleft()
+                    yield item, future.result()
+                continue
+            pending.append((item, pool.submit(func, item)))
+            if len(pending) >= window:
+                item, future = pending.popleft()
+                yield item, future.result()
+        while pending:
+            item, future = pending.popleft()
+            yield item, future.result()
+    else:
+        pending = {}
+        for item in items:
+            if item is None:
+                for future in list(pending):
+                    yield pending.pop(future), future.result()
+                continue
+            pending[pool.submit(func, item)] = item
+            if len(pending) >= window:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield pending.pop(future), future.result()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield pending.pop(future), future.result()
+
+
+def _map_threaded(func, items, jobs, ordered=True):
+    """
+    Yields (item, func(item)) using a pool of jobs threads.
+
+    File reads release the GIL, so threads overlap open/read latency.
+    At most jobs * THREAD_QUEUE_FACTOR calls are in flight, which keeps memory
+    flat on huge trees.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        yield from _imap_pool(pool, func, items, jobs * THREAD_QUEUE_FACTOR, ordered)
+
+
+_worker_cache = None
+
+
+def _parse_chunk(paths, cache_path=None, cache_cls=None):
+    """
+    Process pool worker: parses a chunk of files.
+    Returns compact (path, label_type, label, key) tuples; on failure
+    label_type is None and label holds the reason. With cache_path, cache hits
+    come back with key None and misses carry the key the parent stores them
+    under (empty if stat failed).
+    """
+    global _worker_cache
+    cache = None
+    if cache_cls is not None:
+        if (_worker_cache is None or _worker_cache.__class__ is not cache_cls
+                or _worker_cache.path != cache_path):
+            _worker_cache = cache_cls(cache_path, readonly=True)
+        cache = _worker_cache
+
+    out = []
+    for path in paths:
+        key = None
+        if cache is not None:
+            key, result, hit = cache.resolve(path)
+            key = None if hit else (key or ())
+        else:
+            result = _parse_file_progressive(path)[0]
+        label_type, label = _result_row(result)
+        out.append((path, label_type, label, key))
+    return out
+
+
+def _iter_chunks(items, chunk_size):
+    """Lists of up to chunk_size items; a None item ends the chunk and is passed on."""
+    chunk = []
+    for item in items:
+        if item is None:
+            if chunk:
+                yield chunk
+                chunk = []
+            yield None
+            continue
+        chunk.append(item)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _map_processes(paths, jobs, ordered=True, chunk_size=PROCESS_CHUNK_FILES, cache=None):
+    """
+    Yields (path, result) parsing on a pool of jobs processes.
+
+    Paths are sharded into chunks of chunk_size so each round trip carries
+    enough work to amortize pickling and IPC. Workers read the cache, the
+    parent records their misses.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from functools import partial
+
+    func = _parse_chunk
+    if cache is not None:
+        if cache.path:
+            cache.flush()
+        func = partial(_parse_chunk, cache_path=cache.path, cache_cls=cache.__class__)
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        chunks = _iter_chunks(paths, max(1, chunk_size))
+        for _, parsed in _imap_pool(pool, func, chunks, jobs * 2, ordered):
+            for path, label_type, label, key in parsed:
+                result = _row_result(label_type, label)
+                if cache is not None:
+                    if key is None:
+                        cache.hits += 1
+                    else:
+                        cache.misses += 1
+                        if key:
+                            cache.store(path, key, result)
+                yield path, result
+
+
+def parse_files(paths, *, jobs=1, cache=None, on_error=None, ordered=True, backend="thread"):
+    """
+    Bulk parse_file(): yields (path, result) for each path in an iterable.
+
+    jobs > 1 parses on a bounded pool of threads (backend="process" for
+    processes); results follow input order unless ordered=False. A path of
+    None is a flush point: the results of all paths before it are yielded
+    before the next path is taken, so input that streams in (stdin) is
+    answered while the source blocks.
+    cache: a LabelCache/BlobLabelCache, or a database path opened (and
+    closed) for the duration of the call.
+    on_error decides what happens to files without a label:
+      None     - yield the ParseFailure (falsy, str() is the reason)
+      'skip'   - drop them
+      'raise'  - raise ValueError naming the path and the reason
+      callable - on_error(path, failure); its return value is yielded
+    """
+    if on_error not in (None, 'skip', 'raise') and not callable(on_error):
+        raise ValueError(f"on_error must be None, 'skip', 'raise' or callable: {on_error!r}")
+    own_cache = isinstance(cache, (str, os.PathLike))
+    if own_cache:
+        cache = LabelCache(os.fspath(cache))
+    try:
+        if jobs <= 1:
+            parse = _parse_path if cache is None else cache.parse
+            results = ((path, parse(path)) for path in paths if path is not None)
+        elif backend == "process":
+            results = _map_processes(paths, jobs, ordered, cache=cache)
+        else:
+            parse = _parse_path if cache is None else cache.parse
+            results = _map_threaded(parse, paths, jobs, ordered)
+
+        for path, result in results:
+            if not result and on_error is not None:
+                if on_error == 'skip':
+                    continue
+                if on_error == 'raise':
+                    raise ValueError(f"{path}: {result}")
+                result = on_error(path, result)
+            yield path, result
+    finally:
+        if own_cache:
+            cache.close()
+
+
+async def aparse_files(paths, concurrency=8, *, cache=None, executor=None,
+                       batch=ASYNC_BATCH_FILES):
+    """
+    Async parse_files(): yields (path, result) as parses complete, without
+    blocking the event loop.
+
+    paths may be an iterable or an async iterable. Reads and parses run on
+    executor (default: a pool of concurrency threads) in jobs of batch files,
+    with at most concurrency * THREAD_QUEUE_FACTOR jobs in flight so huge
+    inputs stay bounded. An async source is drained by a separate task: when
+    it has nothing ready, a partial job is submitted at once, and finished
+    results are yielded while it is still waited on. Use batch=1 for the
+    lowest per-file latency. Failures are yielded as ParseFailure, as with
+    parse_files().
+    """
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+
+    loop = asyncio.get_running_loop()
+    parse = _parse_path if cache is None else cache.parse
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(max_workers=max(1, concurrency))
+    window = max(1, concurrency) * THREAD_QUEUE_FACTOR
+    batch = max(1, batch)
+    not_ready = object()
+    exhausted = object()
+
+    def job(chunk):
+        return [(path, parse(path)) for path in chunk]
+
+    producer = getter = None
+    if hasattr(paths, '__aiter__'):
+        queue = asyncio.Queue(window * batch)
+
+        async def produce():
+            async for path in paths:
+                await queue.put(path)
+
+        producer = asyncio.ensure_future(produce())
+
+        def take():
+            """Next path without waiting, not_ready, or exhausted."""
+            nonlocal getter
+            if getter is not None:
+                if getter.done():
+                    path, getter = getter.result(), None
+                    return path
+                if not (producer.done() and queue.empty()):
+                    return not_ready
+                getter.cancel()
+                getter = None
+            if not queue.empty():
+                return queue.get_nowait()
+            if producer.done():
+                producer.result()  # re-raises errors of the source
+                return exhausted
+            return not_ready
+    else:
+        source = iter(paths)
+
+        def take():
+            return next(source, exhausted)
+
+    pending = set()
+    try:
+        chunk = []
+        done_reading = False
+        while True:
+            while not done_reading and len(pending) < window:
+                path = take()
+                if path is not_ready:
+                    break
+                if path is exhausted:
+                    done_reading = True
+                    break
+                chunk.append(path)
+                if len(chunk) >= batch:
+                    pending.add(loop.run_in_executor(executor, job, chunk))
+                    chunk = []
+            if chunk and len(pending) < window:
+                # The source has nothing ready (or ended): don't hold a partial job back
+                pending.add(loop.run_in_executor(executor, job, chunk))
+                chunk = []
+            waits = set(pending)
+            if producer is not None and not done_reading and len(pending) < window:
+                if getter is None:
+                    getter = asyncio.ensure_future(queue.get())
+                waits.add(getter)
+                if not producer.done():
+                    waits.add(producer)
+            if not waits:
+                break
+            done, _ = await asyncio.wait(waits, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                if future in pending:
+                    pending.discard(future)
+                    for item in future.result():
+                        yield item
+    finally:
+        for future in pending:
+            future.cancel()
+        for task in (getter, producer):
+            if task is not None and not task.done():
+                task.cancel()
+        if own_executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def process_path(target_path, show_path=False, show_type=False, jobs=1, ordered=True,
+                 backend="thread", cache=None, out=None, ofpa_only=False):
+    """
+    Recursively processes a file or directory.
+    """
+    process_files(_iter_uasset_files(target_path, ofpa_only), show_path, show_type, jobs,
+                  ordered, backend, cache, out)
+
+
+def process_files(file_paths, show_path=False, show_type=False, jobs=1, ordered=True,
+                  backend="thread", cache=None, out=None):
+    """
+    Processes an iterable of .uasset paths, serially or on jobs threads/processes,
+    optionally through a LabelCache. Output follows input order unless ordered=False.
+    """
+    own_out = out is None
+    if own_out:
+        out = _LineWriter(sys.stdout)
+    try:
+        for file_path, result in parse_files(file_paths, jobs=jobs, cache=cache,
+                                             ordered=ordered, backend=backend):
+            _print_result(file_path, result, show_path, show_type, out=out)
+    finally:
+        if own_out:
+            out.flush()
+
+
+def process_git_objects(names, repo='.', show_path=False, show_type=False, cache=None,
+                        out=None, sep=b'\n'):
+    """
+    Decodes git object names and prints labels; a name of '-' reads
+    sep-separated names from stdin. Stdin is read on the git writer thread,
+    so output is flushed from here once its names have been decoded.
+    """
+    def iter_names():
+        for name in names:
+            if name == '-':
+                for batch in _iter_stdin_batches(sep):
+                    yield from batch
+                    yield None  # input idle: flush git's stdin and our output
+            else:
+                yield name
+
+    if out is None:
+        out = _LineWriter(sys.stdout)
+    try:
+        for name, result in decode_git_objects(iter_names(), repo, cache,
+                                               on_flush=out.flush):
+            _print_result(name, result, show_path, show_type, abspath=False, out=out)
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+    finally:
+        out.flush()
+
+
+class _LineWriter:
+    """
+    Buffered result output. Lines end with end ('\\n', or '\\0' for -z) and
+    are written in batches of OUTPUT_FLUSH_LINES instead of one call per line;
+    flush() pushes a partial batch, e.g. whenever the input stream goes idle.
+
+    This is the plain text format: only decoded labels are printed.
+    """
+    __slots__ = ('stream', 'end', 'files', 'labeled', '_lines', '_limit', '_start')
+
+    def __init__(self, stream, end='\n', flush_lines=OUTPUT_FLUSH_LINES):
+        import time
+
+        self.stream = stream
+        self.end = end
+        self.files = self.labeled = 0
+        self._lines = []
+        self._limit = flush_lines
+        self._start = time.perf_counter()
+
+    def write(self, line):
+        lines = self._lines
+        lines.append(line)
+        if len(lines) >= self._limit:
+            self.flush()
+
+    def emit(self, name, result, show_path=False, show_type=False, abspath=True):
+        """Records one decoded file or git object."""
+        self.files += 1
+        if not result:
+            return
+        self.labeled += 1
+        prop_type, prop_value = result
+        output_parts = []
+
+        if show_path:
+            output_parts.append(os.path.abspath(name) if abspath else name)
+
+        if show_type:
+            output_parts.append(f"[{prop_type}]")
+
+        output_parts.append(prop_value)
+        self.write(" | ".join(output_parts))
+
+    def emit_change(self, status, path, old, new, show_type=False):
+        """Records one changed file from git status/diff with both sides decoded."""
+        self.files += 1
+        if not (old or new):
+            return
+        self.labeled += 1
+        output_parts = [status, path]
+        if show_type:
+            output_parts.append(f"[{(new or old)[0]}]")
+        if old and new and old[1] != new[1]:
+            output_parts.append(f"{old[1]} -> {new[1]}")
+        else:
+            output_parts.append((new or old)[1])
+        self.write(" | ".join(output_parts))
+
+    def summary(self):
+        import time
+
+        return {"files": self.files, "labeled": self.labeled,
+                "failed": self.files - self.labeled,
+                "elapsed_ms": round((time.perf_counter() - self._start) * 1000, 3)}
+
+    def flush(self):
+        if self._lines:
+            end = self.end
+            self.stream.write(end.join(self._lines) + end)
+            self._lines.clear()
+        self.stream.flush()
+
+    def close(self):
+        self.flush()
+
+
+class _RecordWriter(_LineWriter):
+    """
+    Machine-readable output: one record per file, failures included with
+    their reason, in JSON Lines, CSV or TSV. Labels may contain any
+    character, so nothing needs to be split on ' | '.
+
+    close() appends a summary: a {"summary": {...}} line for jsonl, a
+    "Summary:" line on stderr for csv/tsv (keeps the table rectangular).
+    """
+    __slots__ = ('fmt', '_dumps', '_csv', '_buf', '_fields')
+
+    def __init__(self, stream, fmt='jsonl', end='\n', flush_lines=OUTPUT_FLUSH_LINES):
+        super().__init__(stream, end, flush_lines)
+        self.fmt = fmt
+        self._fields = None
+        if fmt == 'jsonl':
+            import json
+            self._dumps = json.JSONEncoder(ensure_ascii=False).encode
+        else:
+            import csv
+            import io
+            self._buf = io.StringIO()
+            dialect = csv.excel_tab if fmt == 'tsv' else csv.excel
+            self._csv = csv.writer(self._buf, dialect, lineterminator=end)
+
+    def emit(self, name, result, show_path=False, show_type=False, abspath=True):
+        self.files += 1
+        if abspath:
+            name = os.path.abspath(name)
+        if result:
+            self.labeled += 1
+            self._record({"path": name, "label_type": result[0], "label": result[1],
+                          "error": None})
+        else:
+            self._record({"path": name, "label_type": None, "label": None,
+                          "error": str(result) if result is not None else "no label"})
+
+    def emit_change(self, status, path, old, new, show_type=False):
+        self.files += 1
+        if old or new:
+            self.labeled += 1
+        side = new or old
+        self._record({"status": status, "path": path,
+                      "label_type": side[0] if side else None,
+                      "label": new[1] if new else None,
+                      "old_label": old[1] if old else None})
+
+    def _record(self, record):
+        if self.fmt == 'jsonl':
+            self.write(self._dumps(record))
+            return
+        if self._fields is None:
+            self._fields = list(record)
+            self._csv.writerow(self._fields)
+        self._csv.writerow(["" if v is None else v for v in record.values()])
+        if self.files % self._limit == 0:
+            self.flush()
+
+    def flush(self):
+        if self.fmt != 'jsonl':
+            self.stream.write(self._buf.getvalue())
+            self._buf.seek(0)
+            self._buf.truncate()
+        super().flush()
+
+    def close(self):
+        if self.fmt == 'jsonl':
+            self.write(self._dumps({"summary": self.summary()}))
+            self.flush()
+        else:
+            self.flush()
+            summary = self.summary()
+            print("Summary: " + " ".join(f"{k}={v}" for k, v in summary.items()),
+                  file=sys.stderr)
+
+
+def _iter_stdin_batches(sep=b'\n'):
+    """
+    Yields lists of the sep-delimited entries in each chunk read from stdin,
+    as it arrives, without waiting for EOF. The next (possibly blocking)
+    read only happens once the previous batch has been consumed.
+    """
+    stream = sys.stdin.buffer
+    read = getattr(stream, 'read1', stream.read)
+    pending = b''
+    while True:
+        chunk = read(STDIN_CHUNK_BYTES)
+        if not chunk:
+            break
+        entries = (pending + chunk).split(sep)
+        pending = entries.pop()
+        if sep == b'\n':
+            entries = [entry.rstrip(b'\r') for entry in entries]
+        batch = [os.fsdecode(entry) for entry in entries if entry]
+        if batch:
+            yield batch
+    if sep == b'\n':
+        pending = pending.rstrip(b'\r')
+    if pending:
+        yield [os.fsdecode(pending)]
+
+
+def _iter_stdin_files(sep=b'\n', on_idle=None, ofpa_only=False):
+    """
+    Stdin entries expanded like command-line paths; .uasset files skip the stat.
+    Each chunk's files are followed by None, a parse_files() flush point, so
+    pooled workers hand back their results; on_idle then runs before the
+    next (possibly blocking) read, so output of a pipeline keeps flowing.
+    """
+    for batch in _iter_stdin_batches(sep):
+        for entry in batch:
+            if entry[-7:].lower() == '.uasset':
+                yield entry
+            else:
+                yield from _iter_uasset_files(entry, ofpa_only)
+        yield None
+        if on_idle is not None:
+            on_idle()
+
+
+def _print_result(file_path, result, show_path=False, show_type=False, abspath=True,
+                  out=None):
+    if out is not None:
+        out.emit(file_path, result, show_path, show_type, abspath)
+        return
+    if not result:
+        return
+    prop_type, prop_value = result
+    output_parts = []
+
+    if show_path:
+        output_parts.append(os.path.abspath(file_path) if abspath else file_path)
+
+    if show_type:
+        output_parts.append(f"[{prop_type}]")
+
+    output_parts.append(prop_value)
+
+    print(" | ".join(output_parts))
+
+
+def process_single_file(file_path, show_path=False, show_type=False, out=None):
     """
     Parses a single .uasset file and prints the label if found.
     """
@@ -221,40 +2709,220 @@ def process_single_file(file_path, show_path=False, show_type=False):
     if parser.parse_name_map():
         result = parser.extract_label_property()
         if result:
-            prop_type, prop_value = result
-            output_parts = []
-            
-            if show_path:
-                output_parts.append(os.path.abspath(file_path))
-            
-            if show_type:
-                output_parts.append(f"[{prop_type}]")
-                
-            output_parts.append(prop_value)
-            
-            print(" | ".join(output_parts))
-    else:
+            _print_result(file_path, result, show_path, show_type, out=out)
+    elif out is not None:
+        out.emit(file_path, parser._result, show_path, show_type)
+
+
+def process_index(args):
+    """--build-index / --find: update or query the reverse label index."""
+    with LabelIndex(args.index) as index:
+        if args.build_index:
+            for path in args.paths:
+                added, changed, removed = index.update(path, args.jobs, args.ofpa_only)
+                print(f"Index: {path}: {added} added, {changed} changed, {removed} removed",
+                      file=sys.stderr)
+            print(f"Index: {len(index)} labeled files ({index.path})", file=sys.stderr)
+        if args.find is None:
+            return
+        end = '\0' if args.nul else '\n'
+        out = (_LineWriter(sys.stdout, end) if args.format == "text"
+               else _RecordWriter(sys.stdout, args.format, end))
+        try:
+            for under in (args.paths if args.paths and not args.build_index else (None,)):
+                for path, result in index.find(args.find, args.match, under):
+                    out.emit(path, result, True, args.show_type, abspath=False)
+        finally:
+            out.close()
+
+
+def process_watch(paths, interval=WATCH_INTERVAL_SECONDS, ofpa_only=False, jobs=1,
+                  cache=None, stream=None, polls=None):
+    """
+    --watch: initial scan, then a poll every interval seconds, writing the
+    LabelWatcher events as JSON lines. A {"event": "ready"} line follows the
+    initial scan. polls limits the number of polls (default: until Ctrl+C).
+    """
+    import json
+    import time
+
+    if stream is None:
+        stream = sys.stdout
+    dumps = json.JSONEncoder(ensure_ascii=False).encode
+    watcher = LabelWatcher(paths, ofpa_only, jobs, cache)
+    count = 0
+    try:
+        while True:
+            start = time.perf_counter()
+            events = watcher.poll()
+            lines = [dumps(event) for event in events]
+            if count == 0:
+                lines.append(dumps({"event": "ready", "labeled": len(watcher),
+                                    "elapsed_ms": round((time.perf_counter() - start) * 1000,
+                                                        3)}))
+            if lines:
+                stream.write("\n".join(lines) + "\n")
+                stream.flush()
+            count += 1
+            if polls is not None and count >= polls:
+                return
+            time.sleep(max(0.0, interval - (time.perf_counter() - start)))
+    except KeyboardInterrupt:
         pass
 
+
 def main():
     if sys.platform == "win32":
         import io
         sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
         sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+        sys.stdin = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8')
 
     parser = argparse.ArgumentParser(
         description="Extract actor names from .uasset files.")
-    parser.add_argument("paths", nargs='+',
-                        help="File or directory paths to scan")
+    parser.add_argument("paths", nargs='*',
+                        help="File or directory paths to scan (git object names with "
+                             "--git-objects, revisions with --git-diff; '-' reads stdin)")
     parser.add_argument("--show-path", action="store_true",
                         help="Show file path in output")
     parser.add_argument("--show-type", action="store_true",
                         help="Show property type (e.g., [ActorLabel]) in output")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="Number of workers for directory scans (default: 1)")
+    parser.add_argument("--backend", choices=("thread", "process"), default="thread",
+                        help="Worker type for --jobs: threads overlap I/O, "
+                             "processes scale CPU-bound parsing (default: thread)")
+    parser.add_argument("--unordered", action="store_true",
+                        help="With --jobs, print results as they complete instead of in scan order")
+    parser.add_argument("--ofpa-only", action="store_true",
+                        help="In directory scans, only visit __ExternalActors__ / "
+                             "__ExternalObjects__ folders")
+    parser.add_argument("--cache", nargs='?', const=default_cache_path(), metavar="DB",
+                        help="Reuse labels of unchanged files from a cache database "
+                             "(default location if DB is omitted)")
+    parser.add_argument("--cache-key", choices=("path", "blob"), default="path",
+                        help="Cache by path+size+mtime, or by git blob OID of the content "
+                             "(shared across paths, branches and checkouts)")
+    parser.add_argument("--git-objects", action="store_true",
+                        help="Decode blobs straight from the git object database; paths are "
+                             "object names such as HEAD~3:Content/X.uasset or blob OIDs")
+    parser.add_argument("--git-status", action="store_true",
+                        help="Decode OFPA files changed in `git status` (both sides)")
+    parser.add_argument("--git-diff", action="store_true",
+                        help="Decode OFPA files changed in `git diff [REV...]` (both sides)")
+    parser.add_argument("--old-rev", default="HEAD", metavar="REV",
+                        help="With --git-diff - and --name-status input: revision the old "
+                             "side is read from (default: HEAD)")
+    parser.add_argument("--new-rev", metavar="REV",
+                        help="With --git-diff - and --name-status input: revision the new "
+                             "side is read from (default: the working tree)")
+    parser.add_argument("--repo", default=".",
+                        help="Repository for git modes (default: current directory)")
+    parser.add_argument("--serve", nargs='?', const="-", metavar="SOCKET",
+                        help="Run as a resident JSON-RPC server on stdin/stdout, or on a "
+                             "Unix domain socket path (Unix only)")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep running: scan the paths, then poll for changes and print "
+                             "added/relabeled/removed events as JSON lines")
+    parser.add_argument("--interval", type=float, default=WATCH_INTERVAL_SECONDS,
+                        metavar="SECONDS",
+                        help="Seconds between polls for --watch (default: %(default)s)")
+    parser.add_argument("--build-index", action="store_true",
+                        help="Scan the paths into the reverse label index (incremental: only "
+                             "new or modified files are parsed)")
+    parser.add_argument("--find", metavar="LABEL",
+                        help="Look up files by label in the index; paths restrict the results "
+                             "to those directories")
+    parser.add_argument("--match", choices=("exact", "prefix", "substring"), default="exact",
+                        help="How --find compares labels, ignoring case (default: exact)")
+    parser.add_argument("--index", default=default_index_path(), metavar="DB",
+                        help="Reverse index database for --build-index/--find "
+                             "(default: %(default)s)")
+    parser.add_argument("--stdin", action="store_true",
+                        help="Also read paths from stdin as a stream (one per line)")
+    parser.add_argument("-z", dest="nul", action="store_true",
+                        help="NUL-delimited stdin entries and output records "
+                             "(e.g. git ls-files -z | get_actor_name.py --stdin -z)")
+    parser.add_argument("--format", choices=("text", "jsonl", "csv", "tsv"), default="text",
+                        help="Output format; jsonl/csv/tsv emit one record per file with "
+                             "path, label_type, label and failure reason, plus a summary")
+    parser.add_argument("--cache-stats", action="store_true",
+                        help="Print cache hit/miss counts to stderr")
 
     args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be >= 1")
+    git_changes = args.git_status or args.git_diff
+    if not args.paths and not (git_changes or args.serve or args.stdin or args.find):
+        parser.error("the following arguments are required: paths")
+
+    if args.serve:
+        import socket
+        if args.serve != "-" and not hasattr(socket, "AF_UNIX"):
+            parser.error("--serve SOCKET: Unix sockets not supported on this platform "
+                         "(use --serve for stdin/stdout)")
+        server = LabelServer(LabelCache(args.cache) if args.cache else None,
+                             BlobLabelCache(args.cache) if args.cache else None)
+        try:
+            if args.serve == "-":
+                server.serve_stream(sys.stdin, sys.stdout)
+            else:
+                server.serve_unix(args.serve)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.close()
+        return
 
-    for path in args.paths:
-        process_path(path, args.show_path, args.show_type)
+    if args.build_index or args.find is not None:
+        process_index(args)
+        return
+
+    if args.watch:
+        cache = LabelCache(args.cache) if args.cache else None
+        try:
+            process_watch(args.paths, args.interval, args.ofpa_only, args.jobs, cache)
+        finally:
+            if cache is not None:
+                cache.close()
+        return
+
+    cache = None
+    if args.cache:
+        if args.cache_key == "blob" or args.git_objects or git_changes:
+            cache = BlobLabelCache(args.cache)
+        else:
+            cache = LabelCache(args.cache)
+    sep = b'\0' if args.nul else b'\n'
+    end = '\0' if args.nul else '\n'
+    if args.format == "text":
+        out = _LineWriter(sys.stdout, end)
+    else:
+        out = _RecordWriter(sys.stdout, args.format, end)
+    try:
+        if git_changes:
+            process_git_changes("status" if args.git_status else "diff", args.paths, args.repo,
+                                args.show_type, cache, args.jobs, out, args.old_rev,
+                                args.new_rev)
+        elif args.git_objects:
+            names = args.paths + ['-'] if args.stdin else args.paths
+            process_git_objects(names, args.repo, args.show_path, args.show_type, cache,
+                                out, sep)
+        else:
+            files = (f for path in args.paths
+                     for f in _iter_uasset_files(path, args.ofpa_only))
+            if args.stdin:
+                from itertools import chain
+                files = chain(files, _iter_stdin_files(sep, out.flush, args.ofpa_only))
+            process_files(files, args.show_path, args.show_type, args.jobs, not args.unordered,
+                          args.backend, cache, out)
+    finally:
+        out.close()
+        if cache is not None:
+            cache.close()
+            if args.cache_stats:
+                print(f"Cache: {cache.hits} hits, {cache.misses} misses ({cache.path})",
+                      file=sys.stderr)
 
 
 if __name__ == "__main__":
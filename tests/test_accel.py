@@ -0,0 +1,131 @@
+import unittest
+import os
+import sys
+import glob
+import random
+import struct
+
+# Add scripts to path to import get_actor_name
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SCRIPTS_DIR = os.path.join(PROJECT_ROOT, 'scripts')
+TESTS_DIR = os.path.join(PROJECT_ROOT, 'tests')
+sys.path.append(SCRIPTS_DIR)
+
+import get_actor_name
+
+TEST_FILES = sorted(glob.glob(os.path.join(TESTS_DIR, '[0-9]*_[0-9]*', '*.uasset')))
+FUZZ_SEED = 20240518
+FUZZ_CASES_PER_FILE = 300
+
+accel = get_actor_name._accel
+
+
+def read_bytes(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def fuzz_corpus():
+    """Seeded mutants of the sample packages plus random noise."""
+    rng = random.Random(FUZZ_SEED)
+    for path in TEST_FILES:
+        data = read_bytes(path)
+        summary = get_actor_name.read_package_summary(data)
+        hot = summary.total_header_size  # summary, name map, import/export maps
+        for _ in range(FUZZ_CASES_PER_FILE):
+            m = bytearray(data)
+            kind = rng.randrange(5)
+            if kind == 0:
+                for _ in range(rng.randint(1, 8)):
+                    m[rng.randrange(hot)] = rng.randrange(256)
+            elif kind == 1:
+                off = rng.randrange(hot - 4)
+                m[off:off + 4] = struct.pack('<i', rng.choice(
+                    (0, 1, -1, 5, 11, 12, -6, 255, 256, rng.randint(-2**31, 2**31 - 1))))
+            elif kind == 2:
+                del m[rng.randrange(len(m)):]
+            elif kind == 3:
+                off = rng.randrange(summary.name_offset, hot)
+                m[off:off] = bytes(rng.randrange(256) for _ in range(rng.randint(1, 16)))
+            else:
+                off = rng.randrange(summary.name_offset, hot - 8)
+                m[off:off + 8] = rng.choice((b'\x0b\0\0\0Acto', b'\x05\0\0\0None', b'\x01\0\0\0/x'))
+            yield summary, bytes(m)
+    for _ in range(200):
+        size = rng.randint(0, 2048)
+        noise = bytes(rng.randrange(256) for _ in range(size))
+        yield None, get_actor_name.UNREAL_ASSET_MAGIC_NUMBER + noise
+
+
+class pure_python:
+    """Context manager routing get_actor_name through the Python implementations."""
+
+    def __enter__(self):
+        self.saved = (get_actor_name._find_label_names, get_actor_name._scan_name_map_location)
+        get_actor_name._find_label_names = get_actor_name._find_label_names_py
+        get_actor_name._scan_name_map_location = get_actor_name._scan_name_map_location_py
+
+    def __exit__(self, *exc):
+        get_actor_name._find_label_names, get_actor_name._scan_name_map_location = self.saved
+
+
+@unittest.skipIf(accel is None, "accelerator not built (python scripts/build_accel.py)")
+class TestAccelParity(unittest.TestCase):
+
+    def setUp(self):
+        self.assertTrue(TEST_FILES, "No test assets found in version folders")
+
+    def check_scan(self, data):
+        size = len(data)
+        self.assertEqual(
+            accel.scan_name_map_location(data, size, get_actor_name.HEADER_SCAN_LIMIT_BYTES,
+                                         get_actor_name.MAX_NAME_COUNT),
+            get_actor_name._scan_name_map_location_py(data, size))
+
+    def check_names(self, data, offset, count):
+        keys = get_actor_name._LABEL_KEYS
+        for hashes in (True, False, None):
+            self.assertEqual(
+                accel.find_label_names(data, offset, count, hashes, keys, b'StrProperty'),
+                get_actor_name._find_label_names_py(data, offset, count, hashes, keys,
+                                                    b'StrProperty'))
+
+    def check_parse(self, data):
+        results = []
+        for pure in (False, True):
+            if pure:
+                with pure_python():
+                    results.append(get_actor_name._parse_uasset(data))
+            else:
+                results.append(get_actor_name._parse_uasset(data))
+        self.assertEqual(results[0], results[1])
+
+    def test_samples(self):
+        for path in TEST_FILES:
+            with self.subTest(file=os.path.basename(path)):
+                data = read_bytes(path)
+                s = get_actor_name.read_package_summary(data)
+                self.check_scan(data)
+                self.check_names(data, s.name_offset, s.name_count)
+                for cut in (64, 700, 1024, s.total_header_size):
+                    self.check_names(data[:cut], s.name_offset, s.name_count)
+                self.check_parse(data)
+
+    def test_fuzzed_corpus(self):
+        for n, (summary, data) in enumerate(fuzz_corpus()):
+            with self.subTest(case=n):
+                self.check_scan(data)
+                if summary is not None:
+                    self.check_names(data, summary.name_offset, summary.name_count)
+                    self.check_names(data, summary.name_offset + 4, summary.name_count)
+                self.check_parse(data)
+
+    def test_rejects_bad_arguments(self):
+        with self.assertRaises(TypeError):
+            accel.find_label_names(b'', 0, 1, True, ('x',), b'StrProperty')
+        with self.assertRaises(ValueError):
+            accel.find_label_names(b'', 0, 1, True, (b'x',) * 9, b'StrProperty')
+
+
+if __name__ == '__main__':
+    unittest.main()
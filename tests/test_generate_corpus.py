@@ -0,0 +1,84 @@
+import unittest
+import os
+import sys
+import json
+import shutil
+import tempfile
+
+# Add scripts to path to import get_actor_name and generate_corpus
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SCRIPTS_DIR = os.path.join(PROJECT_ROOT, 'scripts')
+sys.path.append(SCRIPTS_DIR)
+
+import get_actor_name
+import generate_corpus
+
+
+def read_bytes(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+class TestGenerateCorpus(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def generate(self, name, files=40, **kwargs):
+        out = os.path.join(self.tmp, name)
+        manifest = os.path.join(out, 'manifest.jsonl')
+        self.assertEqual(generate_corpus.generate(out, files, manifest=manifest, **kwargs),
+                         files)
+        with open(manifest, encoding='utf-8') as f:
+            return out, [json.loads(line) for line in f]
+
+    def test_every_layout_decodes(self):
+        """Packages of each version decode through the summary and export map."""
+        out, records = self.generate('all', files=80, seed=1, utf16=0.5, size=(0, 20000))
+        self.assertEqual({r['version'] for r in records}, set(generate_corpus.PROFILES))
+        self.assertTrue(any(not r['label'].isascii() for r in records))
+        for r in records:
+            with self.subTest(path=r['path']):
+                path = os.path.join(out, r['path'])
+                data = read_bytes(path)
+                summary = get_actor_name.read_package_summary(data)
+                self.assertIsNotNone(summary)
+                self.assertEqual(len(data), r['size'])
+                self.assertEqual(get_actor_name.parse_file(path), ('ActorLabel', r['label']))
+                props = get_actor_name.extract_properties(data, [get_actor_name.ACTOR_CLASS])
+                self.assertTrue(props[get_actor_name.ACTOR_CLASS].startswith('/Script/Engine.'))
+
+    def test_controls(self):
+        out, records = self.generate('ctl', files=20, seed=2, versions=['5.4'],
+                                     names=(300, 300), size=(50000, 50000), fanout=(2, 3),
+                                     maps=2)
+        dirs = set()
+        for r in records:
+            data = read_bytes(os.path.join(out, r['path']))
+            self.assertEqual(get_actor_name.read_package_summary(data).name_count, 300)
+            self.assertEqual(len(data), 50000)
+            dirs.add(tuple(r['path'].split('/')[3:6]))
+        self.assertTrue(all(m in ('Map0', 'Map1') and len(a) == 1 and len(b) == 1
+                            for m, a, b in dirs))
+        self.assertLessEqual(len(dirs), 2 * 2 * 3)
+
+    def test_deterministic_by_seed(self):
+        a, first = self.generate('a', seed=5)
+        b, second = self.generate('b', seed=5)
+        _, other = self.generate('c', seed=6)
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+        for r in first:
+            self.assertEqual(read_bytes(os.path.join(a, r['path'])),
+                             read_bytes(os.path.join(b, r['path'])))
+
+    def test_unknown_version(self):
+        with self.assertRaises(ValueError):
+            generate_corpus.generate(self.tmp, 1, versions=['4.27'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,6 +4,8 @@ import os
 import sys
 import re
 import glob
+import shutil
+import tempfile
 
 # Paths
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
@@ -119,6 +121,257 @@ class TestGetActorNameCLI(unittest.TestCase):
                     f"Expected {len(files)} results, got {len(output_lines)}"
                 )
 
+    def test_jobs_matches_serial_output(self):
+        """Test --jobs keeps the serial scan order, --unordered keeps the same set."""
+        serial = self.run_script([TESTS_DIR, "--show-path"])
+        threaded = self.run_script([TESTS_DIR, "--show-path", "--jobs", "4"])
+        unordered = self.run_script([TESTS_DIR, "--show-path", "--jobs", "4", "--unordered"])
+        self.assertEqual(threaded.returncode, 0)
+        self.assertTrue(serial.stdout.strip())
+        self.assertEqual(threaded.stdout, serial.stdout)
+        self.assertEqual(sorted(unordered.stdout.splitlines()), sorted(serial.stdout.splitlines()))
+
+    def test_process_backend_matches_serial_output(self):
+        """Test --backend process returns the same ordered results as a serial scan."""
+        serial = self.run_script([TESTS_DIR, "--show-path", "--show-type"])
+        pooled = self.run_script([TESTS_DIR, "--show-path", "--show-type",
+                                  "--jobs", "2", "--backend", "process"])
+        self.assertEqual(pooled.returncode, 0)
+        self.assertEqual(pooled.stdout, serial.stdout)
+
+    @unittest.skipUnless(shutil.which("git"), "git not installed")
+    def test_git_objects_from_history(self):
+        """Test --git-objects decodes historical blobs without checking them out."""
+        assets = [a['path'] for a in TEST_ASSETS][:2]
+        expected = [self.run_script([a]).stdout.strip() for a in assets]
+        repo = tempfile.mkdtemp()
+        try:
+            git = ["git", "-C", repo, "-c", "user.name=t", "-c", "user.email=t@t"]
+            subprocess.run(["git", "init", "-q", repo], check=True)
+            for asset in assets:
+                shutil.copy(asset, os.path.join(repo, "Actor.uasset"))
+                subprocess.run(git + ["add", "Actor.uasset"], check=True)
+                subprocess.run(git + ["commit", "-qm", "update"], check=True)
+            oid = subprocess.run(git + ["rev-parse", "HEAD~1:Actor.uasset"], check=True,
+                                 capture_output=True, text=True).stdout.strip()
+
+            result = self.run_script(["--git-objects", "--repo", repo, "--show-path",
+                                      "HEAD~1:Actor.uasset", "HEAD:Actor.uasset",
+                                      "HEAD:Missing.uasset", oid])
+            self.assertEqual(result.returncode, 0)
+            self.assertEqual(result.stdout.splitlines(), [
+                f"HEAD~1:Actor.uasset | {expected[0]}",
+                f"HEAD:Actor.uasset | {expected[1]}",
+                f"{oid} | {expected[0]}",
+            ])
+        finally:
+            shutil.rmtree(repo, ignore_errors=True)
+
+    @unittest.skipUnless(shutil.which("git"), "git not installed")
+    def test_git_status_decorates_changed_actors(self):
+        """Test --git-status decodes both sides of changed OFPA files only."""
+        assets = [a['path'] for a in TEST_ASSETS][:2]
+        labels = [self.run_script([a]).stdout.strip() for a in assets]
+        repo = tempfile.mkdtemp()
+        try:
+            git = ["git", "-C", repo, "-c", "user.name=t", "-c", "user.email=t@t"]
+            actors = os.path.join(repo, "Content", "__ExternalActors__", "Map")
+            os.makedirs(actors)
+            subprocess.run(["git", "init", "-q", repo], check=True)
+            shutil.copy(assets[0], os.path.join(actors, "A.uasset"))
+            shutil.copy(assets[1], os.path.join(actors, "B.uasset"))
+            shutil.copy(assets[0], os.path.join(repo, "Content", "Plain.uasset"))
+            subprocess.run(git + ["add", "."], check=True)
+            subprocess.run(git + ["commit", "-qm", "init"], check=True)
+
+            shutil.copy(assets[1], os.path.join(actors, "A.uasset"))
+            os.remove(os.path.join(actors, "B.uasset"))
+            shutil.copy(assets[1], os.path.join(repo, "Content", "Plain.uasset"))
+
+            result = self.run_script(["--git-status", "--repo", repo])
+            self.assertEqual(result.returncode, 0)
+            self.assertEqual(result.stdout.splitlines(), [
+                f"M | Content/__ExternalActors__/Map/A.uasset | {labels[0]} -> {labels[1]}",
+                f"D | Content/__ExternalActors__/Map/B.uasset | {labels[1]}",
+            ])
+        finally:
+            shutil.rmtree(repo, ignore_errors=True)
+
+    @unittest.skipUnless(shutil.which("git"), "git not installed")
+    def test_git_status_conflict_uses_ours(self):
+        """Test --git-status takes the old side of unmerged files from HEAD, not the base."""
+        import json
+        assets = [a['path'] for a in TEST_ASSETS][:3]
+        labels = [self.run_script([a]).stdout.strip() for a in assets]
+        repo = tempfile.mkdtemp()
+        try:
+            git = ["git", "-C", repo, "-c", "user.name=t", "-c", "user.email=t@t"]
+            actors = os.path.join(repo, "Content", "__ExternalActors__", "Map")
+            os.makedirs(actors)
+            subprocess.run(["git", "init", "-q", "-b", "main", repo], check=True)
+            shutil.copy(assets[0], os.path.join(actors, "A.uasset"))
+            subprocess.run(git + ["add", "."], check=True)
+            subprocess.run(git + ["commit", "-qm", "base"], check=True)
+            subprocess.run(git + ["checkout", "-qb", "side"], check=True)
+            for name, asset in (("A.uasset", assets[1]), ("B.uasset", assets[0])):
+                shutil.copy(asset, os.path.join(actors, name))
+            subprocess.run(git + ["add", "."], check=True)
+            subprocess.run(git + ["commit", "-qm", "side"], check=True)
+            subprocess.run(git + ["checkout", "-q", "main"], check=True)
+            for name, asset in (("A.uasset", assets[2]), ("B.uasset", assets[2])):
+                shutil.copy(asset, os.path.join(actors, name))
+            subprocess.run(git + ["add", "."], check=True)
+            subprocess.run(git + ["commit", "-qm", "main"], check=True)
+            merge = subprocess.run(git + ["merge", "-q", "side"], capture_output=True)
+            self.assertNotEqual(merge.returncode, 0)
+
+            result = self.run_script(["--git-status", "--repo", repo, "--format", "jsonl"])
+            self.assertEqual(result.returncode, 0)
+            records = [json.loads(line) for line in result.stdout.splitlines()][:-1]
+            # UU (modified on both sides) and AA (added on both sides, no merge base)
+            self.assertEqual([(r["path"][-8:], r["status"], r["old_label"]) for r in records],
+                             [("A.uasset", "U", labels[2]), ("B.uasset", "A", labels[2])])
+        finally:
+            shutil.rmtree(repo, ignore_errors=True)
+
+    @unittest.skipUnless(shutil.which("git"), "git not installed")
+    def test_git_diff_name_status_from_stdin(self):
+        """Test --git-diff - reads name-status sides from --old-rev/--new-rev."""
+        import json
+        assets = [a['path'] for a in TEST_ASSETS][:2]
+        labels = [self.run_script([a]).stdout.strip() for a in assets]
+        repo = tempfile.mkdtemp()
+        try:
+            git = ["git", "-C", repo, "-c", "user.name=t", "-c", "user.email=t@t"]
+            actors = os.path.join(repo, "Content", "__ExternalActors__", "Map")
+            os.makedirs(actors)
+            subprocess.run(["git", "init", "-q", repo], check=True)
+            shutil.copy(assets[0], os.path.join(actors, "A.uasset"))
+            shutil.copy(assets[1], os.path.join(actors, "B.uasset"))
+            subprocess.run(git + ["add", "."], check=True)
+            subprocess.run(git + ["commit", "-qm", "init"], check=True)
+            shutil.copy(assets[1], os.path.join(actors, "A.uasset"))
+            os.remove(os.path.join(actors, "B.uasset"))
+            subprocess.run(git + ["commit", "-qam", "change"], check=True)
+            shutil.copy(assets[0], os.path.join(actors, "A.uasset"))  # not part of the diff
+
+            diff = subprocess.run(git + ["diff", "--name-status", "-z", "HEAD~1", "HEAD"],
+                                  check=True, capture_output=True).stdout
+            result = subprocess.run(
+                [sys.executable, SCRIPT_PATH, "--git-diff", "-", "--repo", repo,
+                 "--old-rev", "HEAD~1", "--new-rev", "HEAD", "--format", "jsonl"],
+                input=diff, capture_output=True)
+            self.assertEqual(result.returncode, 0)
+            records = [json.loads(line) for line in result.stdout.decode().splitlines()][:-1]
+            self.assertEqual([(r["status"], r["label"], r["old_label"]) for r in records], [
+                ("M", labels[1], labels[0]),
+                ("D", None, labels[1]),
+            ])
+        finally:
+            shutil.rmtree(repo, ignore_errors=True)
+
+    def test_serve_stdio_protocol(self):
+        """Test --serve answers batched JSON-RPC decode requests over stdin/stdout."""
+        import json
+        paths = [a['path'] for a in TEST_ASSETS]
+        expected = [self.run_script([p]).stdout.strip() for p in paths]
+        requests = [
+            {"jsonrpc": "2.0", "id": 1, "method": "decode", "params": {"paths": paths}},
+            {"jsonrpc": "2.0", "id": 2, "method": "decode", "params": {"paths": paths[:1]}},
+            {"jsonrpc": "2.0", "id": 3, "method": "nope"},
+            {"jsonrpc": "2.0", "id": 4, "method": "shutdown"},
+        ]
+        result = subprocess.run(
+            [sys.executable, SCRIPT_PATH, "--serve"],
+            input="".join(json.dumps(r) + "\n" for r in requests),
+            capture_output=True, text=True, encoding='utf-8'
+        )
+        self.assertEqual(result.returncode, 0)
+        responses = [json.loads(line) for line in result.stdout.splitlines()]
+        self.assertEqual([r["id"] for r in responses], [1, 2, 3, 4])
+        self.assertEqual([r["label"] for r in responses[0]["result"]], expected)
+        self.assertEqual(responses[1]["result"][0]["label"], expected[0])
+        self.assertEqual(responses[2]["error"]["code"], -32601)
+
+    def test_serve_socket_needs_af_unix(self):
+        """Test --serve SOCKET fails with a usage error where Unix sockets are missing."""
+        code = ("import runpy, socket, sys\n"
+                "if hasattr(socket, 'AF_UNIX'):\n"
+                "    del socket.AF_UNIX\n"
+                "sys.argv = ['get_actor_name.py', '--serve', 'x.sock']\n"
+                f"runpy.run_path({SCRIPT_PATH!r}, run_name='__main__')\n")
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+        self.assertEqual(result.returncode, 2)
+        self.assertIn("Unix sockets not supported", result.stderr)
+        self.assertNotIn("Traceback", result.stderr)
+
+    def test_stdin_streams_with_jobs(self):
+        """Test --stdin --jobs answers each path before stdin is closed, for both backends."""
+        import threading
+        paths = [a['path'] for a in TEST_ASSETS][:2]
+        expected = [self.run_script([p]).stdout.strip() for p in paths]
+        for backend in ("thread", "process"):
+            with self.subTest(backend=backend):
+                proc = subprocess.Popen(
+                    [sys.executable, SCRIPT_PATH, "--stdin", "--jobs", "2", "--backend", backend],
+                    stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, encoding='utf-8')
+                try:
+                    for path, label in zip(paths, expected):
+                        proc.stdin.write(path + "\n")
+                        proc.stdin.flush()
+                        line = []
+                        reader = threading.Thread(
+                            target=lambda: line.append(proc.stdout.readline()), daemon=True)
+                        reader.start()
+                        reader.join(10)
+                        self.assertEqual(line, [label + "\n"])
+                finally:
+                    proc.stdin.close()
+                    proc.wait(10)
+                    proc.stdout.close()
+
+    def test_stdin_nul_delimited(self):
+        """Test --stdin -z reads NUL-delimited paths and writes NUL-terminated records."""
+        paths = [a['path'] for a in TEST_ASSETS]
+        expected = [self.run_script([p]).stdout.strip() for p in paths]
+        result = subprocess.run(
+            [sys.executable, SCRIPT_PATH, "--stdin", "-z"],
+            input="\0".join(paths).encode('utf-8'),
+            capture_output=True
+        )
+        self.assertEqual(result.returncode, 0)
+        self.assertTrue(result.stdout.endswith(b"\0"))
+        self.assertEqual(result.stdout.decode('utf-8').split("\0")[:-1], expected)
+
+    def test_format_jsonl_and_csv(self):
+        """Test --format jsonl/csv emit one record per file, failures included."""
+        import csv
+        import io
+        import json
+        paths = [a['path'] for a in TEST_ASSETS]
+        expected = [self.run_script([p]).stdout.strip() for p in paths]
+        not_uasset = os.path.join(PROJECT_ROOT, 'README.md')
+
+        result = self.run_script(paths + [not_uasset, "--format", "jsonl"])
+        self.assertEqual(result.returncode, 0)
+        lines = [json.loads(line) for line in result.stdout.splitlines()]
+        self.assertEqual([r["label"] for r in lines[:-2]], expected)
+        self.assertIsNone(lines[-2]["label"])
+        self.assertTrue(lines[-2]["error"])
+        self.assertEqual(lines[-1]["summary"]["files"], len(paths) + 1)
+        self.assertEqual(lines[-1]["summary"]["failed"], 1)
+
+        result = self.run_script(paths + ["--format", "csv"])
+        rows = list(csv.reader(io.StringIO(result.stdout)))
+        self.assertEqual(rows[0], ["path", "label_type", "label", "error"])
+        self.assertEqual([r[2] for r in rows[1:]], expected)
+        self.assertIn("Summary:", result.stderr)
+
+        result = self.run_script(paths + ["--format", "tsv", "-z"])
+        records = result.stdout.split("\0")
+        self.assertEqual(records[-1], "")
+        self.assertEqual([r.split("\t")[2] for r in records[1:-1]], expected)
+
     def test_missing_file(self):
         """Test behavior when file does not exist."""
         missing_path = os.path.join(PROJECT_ROOT, 'non_existent_file.uasset')
@@ -0,0 +1,686 @@
+import unittest
+import os
+import struct
+import sys
+import glob
+import shutil
+import tempfile
+
+# Add scripts to path to import get_actor_name
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SCRIPTS_DIR = os.path.join(PROJECT_ROOT, 'scripts')
+TESTS_DIR = os.path.join(PROJECT_ROOT, 'tests')
+sys.path.append(SCRIPTS_DIR)
+
+import get_actor_name
+
+TEST_FILES = sorted(glob.glob(os.path.join(TESTS_DIR, '[0-9]*_[0-9]*', '*.uasset')))
+
+
+def read_bytes(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+class TestProgressiveRead(unittest.TestCase):
+
+    def setUp(self):
+        self.assertTrue(TEST_FILES, "No test assets found in version folders")
+        self._saved = get_actor_name.PROGRESSIVE_READ_BYTES
+
+    def tearDown(self):
+        get_actor_name.PROGRESSIVE_READ_BYTES = self._saved
+
+    def test_matches_full_parse(self):
+        """Progressive reads return the same result as parsing the whole file."""
+        for block in (64, 1024, 4096, self._saved):
+            get_actor_name.PROGRESSIVE_READ_BYTES = block
+            for path in TEST_FILES:
+                with self.subTest(block=block, file=os.path.basename(path)):
+                    expected = get_actor_name._parse_uasset(read_bytes(path))
+                    self.assertIsNotNone(expected)
+                    self.assertEqual(get_actor_name.parse_file(path), expected)
+
+    def test_large_actor_partial_read(self):
+        """Large actors are decoded without reading the whole file."""
+        path = max(TEST_FILES, key=os.path.getsize)
+        result, data = get_actor_name._parse_file_progressive(path)
+        self.assertIsNotNone(result)
+        self.assertLess(len(data), os.path.getsize(path))
+
+    def test_truncated_prefix_requests_more(self):
+        """A prefix that ends before the tag asks for more bytes instead of guessing."""
+        for path in TEST_FILES:
+            with self.subTest(file=os.path.basename(path)):
+                data = read_bytes(path)
+                needed = get_actor_name._parse_uasset(data[:1024], len(data))
+                self.assertIsInstance(needed, int)
+                self.assertGreater(needed, 1024)
+
+    def test_mmap_matches_bytes(self):
+        """Parsing over an mmap gives the same results as over bytes."""
+        import mmap
+        for path in TEST_FILES:
+            with self.subTest(file=os.path.basename(path)):
+                with open(path, 'rb') as f, \
+                        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    self.assertEqual(get_actor_name._parse_uasset(mm),
+                                     get_actor_name._parse_uasset(read_bytes(path)))
+
+    def test_large_prefix_switches_to_mmap(self):
+        saved = get_actor_name.MMAP_MIN_BYTES
+        get_actor_name.MMAP_MIN_BYTES = 1
+        get_actor_name.PROGRESSIVE_READ_BYTES = 64
+        try:
+            for path in TEST_FILES:
+                with self.subTest(file=os.path.basename(path)):
+                    result, data = get_actor_name._parse_file_progressive(path)
+                    self.assertEqual(result, get_actor_name._parse_uasset(read_bytes(path)))
+                    self.assertEqual(len(data), 64)
+        finally:
+            get_actor_name.MMAP_MIN_BYTES = saved
+
+    def test_missing_file(self):
+        self.assertIsNone(get_actor_name.parse_file(os.path.join(TESTS_DIR, 'missing.uasset')))
+
+
+class TestPackageSummary(unittest.TestCase):
+
+    # (ue5 version, total header size, name count, name offset, export count, export offset)
+    EXPECTED = {
+        '5_3': (1009, 3432, 36, 571, 4, 2116),
+        '5_4': (1012, 3620, 41, 552, 6, 2165),
+        '5_6': (1013, 13957, 186, 610, 55, 6454),
+        '5_7': (1017, 1737, 18, 441, 1, 1129),
+    }
+
+    def test_sample_fields(self):
+        for path in TEST_FILES:
+            version = os.path.basename(os.path.dirname(path))
+            with self.subTest(version=version):
+                s = get_actor_name.read_package_summary(read_bytes(path))
+                self.assertIsNotNone(s)
+                self.assertEqual((s.file_version_ue5, s.total_header_size, s.name_count,
+                                  s.name_offset, s.export_count, s.export_offset),
+                                 self.EXPECTED[version])
+                self.assertTrue(s.folder_name.endswith(os.path.splitext(os.path.basename(path))[0]))
+
+    def test_unknown_layout_falls_back_to_scan(self):
+        """An unsupported LegacyFileVersion still decodes through the heuristic scan."""
+        for path in TEST_FILES:
+            with self.subTest(file=os.path.basename(path)):
+                data = bytearray(read_bytes(path))
+                expected = get_actor_name._parse_uasset(bytes(data))
+                data[4:8] = (-5).to_bytes(4, 'little', signed=True)
+                self.assertIsNone(get_actor_name.read_package_summary(bytes(data)))
+                self.assertEqual(get_actor_name._parse_uasset(bytes(data)), expected)
+
+    def test_scan_finds_none_folder_name(self):
+        """The heuristic scan accepts FolderName "None" and ignores look-alikes."""
+        header = (get_actor_name.UNREAL_ASSET_MAGIC_NUMBER + b'\0' * 28
+                  + struct.pack('<i', 300) + b'/x'  # too long to be the FolderName
+                  + struct.pack('<i', 5) + b'None\0'
+                  + struct.pack('<iii', 0, 12, 200))
+        data = header + b'\0' * 400
+        self.assertEqual(get_actor_name._scan_name_map_location(data, len(data)), (12, 200))
+        self.assertEqual(get_actor_name._scan_name_map_location(b'\0' * 400, 400), (0, 0))
+
+    def test_truncated_summary(self):
+        data = read_bytes(TEST_FILES[0])
+        self.assertIsNone(get_actor_name.read_package_summary(data[:200]))
+
+
+class TestLabelValue(unittest.TestCase):
+
+    def tag(self, value, ue5):
+        """Label tag for names 1 (ActorLabel) and 2 (StrProperty) followed by value."""
+        if value.isascii():
+            body = struct.pack('<i', len(value) + 1) + value.encode() + b'\0'
+        else:
+            body = struct.pack('<i', -(len(value) + 1)) + value.encode('utf-16le') + b'\0\0'
+        if ue5 >= 1012:
+            head = struct.pack('<iiiiii', 1, 0, 2, 0, 0, len(body)) + b'\0'
+        else:
+            head = struct.pack('<iiiiii', 1, 0, 2, 0, len(body), 0) + b'\0'
+            if ue5 >= 1011:
+                head += b'\0'
+        return head + body + b'\0' * 8
+
+    def test_layouts(self):
+        for ue5 in (1009, 1011, 1012, 1017):
+            for value in ('Floor_01', 'Bühne'):
+                with self.subTest(ue5=ue5, value=value):
+                    data = self.tag(value, ue5)
+                    self.assertEqual(get_actor_name._read_str_tag_value(data, 0, len(data), ue5),
+                                     value)
+                    self.assertEqual(get_actor_name._decode_label_value(data, 0, len(data), ue5),
+                                     value)
+
+    def test_bad_size_falls_back_to_search(self):
+        data = bytearray(self.tag('Floor_01', 1017))
+        data[20:24] = struct.pack('<i', 999)
+        self.assertIsNone(get_actor_name._read_str_tag_value(bytes(data), 0, len(data), 1017))
+        self.assertEqual(get_actor_name._decode_label_value(bytes(data), 0, len(data), 1017),
+                         'Floor_01')
+        self.assertEqual(get_actor_name._decode_label_value(bytes(data), 0, len(data)),
+                         'Floor_01')
+
+
+class TestNameTable(unittest.TestCase):
+
+    @staticmethod
+    def build_map(names):
+        out = []
+        for name in names:
+            if name.isascii():
+                raw = name.encode('ascii') + b'\0'
+                out.append(struct.pack('<i', len(raw)) + raw)
+            else:
+                raw = name.encode('utf-16le') + b'\0\0'
+                out.append(struct.pack('<i', -(len(raw) // 2)) + raw)
+            out.append(b'\xab\xcd\xef\x01')  # hash pair
+        return b''.join(out)
+
+    def test_lookup_and_decode(self):
+        names = ['None', 'ActorLabel', 'Größe', 'StrProperty', 'ActorLabel']
+        table = get_actor_name.NameTable(self.build_map(names), 0, len(names))
+        self.assertEqual(table.find(b'StrProperty'), 3)
+        self.assertEqual(table.find('ActorLabel'), 1)
+        self.assertEqual(table.find('Größe'), 2)
+        self.assertEqual(table.find(b'Missing'), -1)
+        self.assertIn(b'None', table)
+        self.assertEqual(list(table), names)
+        self.assertEqual(table[-1], 'ActorLabel')
+        self.assertTrue(table.complete)
+
+    def test_walks_lazily(self):
+        names = ['None', 'ActorLabel', 'StrProperty', 'Tail']
+        table = get_actor_name.NameTable(self.build_map(names), 0, len(names))
+        self.assertEqual(table.find(b'ActorLabel'), 1)
+        self.assertEqual(len(table._offsets), 2)
+        self.assertEqual(table.find(b'None'), 0)
+        self.assertEqual(len(table._offsets), 2)
+
+    def test_truncated(self):
+        names = ['None', 'ActorLabel', 'StrProperty']
+        data = self.build_map(names)
+        table = get_actor_name.NameTable(data[:20], 0, len(names))
+        self.assertEqual(table.find(b'StrProperty'), -1)
+        self.assertFalse(table.complete)
+        with self.assertRaises(IndexError):
+            table[2]
+
+    def test_samples(self):
+        for path in TEST_FILES:
+            with self.subTest(file=os.path.basename(path)):
+                data = read_bytes(path)
+                table = get_actor_name.read_name_table(data)
+                self.assertTrue(table.complete)
+                self.assertEqual(len(list(table)), len(table))
+                self.assertIn('None', table)
+                for i, name in enumerate(table):
+                    self.assertEqual(table[table.find(name)], name)
+                    self.assertLessEqual(table.find(name), i)
+
+
+class TestExportLookup(unittest.TestCase):
+
+    def test_export_map_ends_at_depends(self):
+        """The computed FObjectExport size walks exactly to DependsOffset."""
+        for path in TEST_FILES:
+            with self.subTest(file=os.path.basename(path)):
+                s = get_actor_name.read_package_summary(read_bytes(path))
+                stride = get_actor_name._export_entry_bytes(s.file_version_ue5)
+                self.assertEqual(s.export_offset + s.export_count * stride, s.depends_offset)
+
+    def test_reads_only_actor_export(self):
+        """Past the header, only the actor export's serial range is fetched."""
+        path = max(TEST_FILES, key=os.path.getsize)
+        data = read_bytes(path)
+        header = get_actor_name.read_package_summary(data).total_header_size
+        reads = []
+
+        def read_at(offset, count):
+            reads.append((offset, count))
+            return data[offset:offset + count]
+
+        result = get_actor_name._parse_uasset(data[:header], len(data), read_at)
+        self.assertEqual(result, get_actor_name._parse_uasset(data))
+        self.assertEqual(reads, [(29110, 872)])
+
+
+class TestExtractProperties(unittest.TestCase):
+
+    WANTED = ('ActorClass', 'ActorLabel', 'FolderLabel', 'FolderPath', 'FolderGuid',
+              'ActorGuid', 'bCastShadowAsTwoSided', 'TargetDisplayOrderList',
+              'LandscapeMaterial', 'RuntimeGrid', 'HLODLayer', 'DataLayerAssets')
+
+    EXPECTED = {
+        '5_3': {'ActorClass': '/Game/AncientContent/Blueprints/Camera/'
+                              'BP_IntroCameraActor.BP_IntroCameraActor_C',
+                'ActorGuid': '50CFED214B6FF5F59D408AA52839573C',
+                'ActorLabel': 'BP_IntroCameraActor2',
+                'FolderPath': 'NewFolder1_FolderCheck_53'},
+        '5_4': {'ActorClass': '/Script/Engine.PlayerStart',
+                'ActorGuid': 'D9B7949D4DA1AED7CF009198FC75D97D',
+                'ActorLabel': 'PlayerStart'},
+        '5_6': {'ActorClass': '/Script/Landscape.LandscapeStreamingProxy',
+                'ActorGuid': 'D8CCC9C13C953F5E89264476AB981043',
+                'ActorLabel': 'LandscapeStreamingProxy_7_2_0',
+                'bCastShadowAsTwoSided': True,
+                'TargetDisplayOrderList': ['None', '__LANDSCAPE_VISIBILITY__'],
+                'LandscapeMaterial': '/Engine/OpenWorldTemplate/LandscapeMaterial/'
+                                     'M_ProcGrid.M_ProcGrid'},
+        '5_7': {'ActorClass': '/Script/Engine.ActorFolder',
+                'FolderGuid': 'AEC7BD9B4F6CD6D021B9599ACB732A47',
+                'FolderLabel': 'Lighting'},
+    }
+
+    def test_samples(self):
+        for path in TEST_FILES:
+            version = os.path.basename(os.path.dirname(path))
+            with self.subTest(version=version):
+                self.assertEqual(get_actor_name.parse_file_properties(path, self.WANTED),
+                                 self.EXPECTED[version])
+                self.assertEqual(get_actor_name.extract_properties(read_bytes(path), self.WANTED),
+                                 self.EXPECTED[version])
+
+    def test_label_agrees_with_parse_file(self):
+        for path in TEST_FILES:
+            with self.subTest(file=os.path.basename(path)):
+                label_type, label = get_actor_name.parse_file(path)
+                props = get_actor_name.parse_file_properties(path, [label_type])
+                self.assertEqual(props, {label_type: label})
+
+    def test_not_a_package(self):
+        self.assertFalse(get_actor_name.extract_properties(b'\0' * 64, ['ActorLabel']))
+
+
+class TestParseFiles(unittest.TestCase):
+
+    def setUp(self):
+        self.missing = os.path.join(TESTS_DIR, 'missing.uasset')
+        self.paths = TEST_FILES + [self.missing]
+
+    def test_matches_parse_file_in_order(self):
+        expected = [(p, get_actor_name.parse_file(p)) for p in TEST_FILES]
+        for jobs in (1, 3):
+            with self.subTest(jobs=jobs):
+                results = list(get_actor_name.parse_files(self.paths, jobs=jobs))
+                self.assertEqual(results[:-1], expected)
+                path, failure = results[-1]
+                self.assertEqual(path, self.missing)
+                self.assertIsInstance(failure, get_actor_name.ParseFailure)
+                self.assertFalse(failure)
+
+    def test_on_error(self):
+        parse_files = get_actor_name.parse_files
+        self.assertEqual(len(list(parse_files(self.paths, on_error='skip'))), len(TEST_FILES))
+        with self.assertRaisesRegex(ValueError, 'missing.uasset'):
+            list(parse_files(self.paths, on_error='raise'))
+        seen = []
+        results = dict(parse_files(self.paths, on_error=lambda p, f: seen.append(p)))
+        self.assertEqual(seen, [self.missing])
+        self.assertIsNone(results[self.missing])
+        with self.assertRaises(ValueError):
+            next(parse_files(self.paths, on_error='ignore'))
+
+    def test_async_matches_sync(self):
+        import asyncio
+
+        async def collect(paths, **kwargs):
+            return [item async for item in get_actor_name.aparse_files(paths, 2, **kwargs)]
+
+        async def agen():
+            for path in self.paths:
+                yield path
+
+        expected = sorted(get_actor_name.parse_files(self.paths))
+        for batch in (1, 3):
+            with self.subTest(batch=batch):
+                self.assertEqual(sorted(asyncio.run(collect(self.paths * 5, batch=batch))),
+                                 sorted(expected * 5))
+        self.assertEqual(sorted(asyncio.run(collect(agen()))), expected)
+
+    def test_async_yields_while_source_waits(self):
+        """Results of a partial batch arrive before an async source produces more."""
+        import asyncio
+
+        async def run():
+            resume = asyncio.Event()
+
+            async def agen():
+                for path in TEST_FILES[:3]:
+                    yield path
+                await resume.wait()
+                yield TEST_FILES[3]
+
+            seen = []
+            async for path, result in get_actor_name.aparse_files(agen(), 2):
+                seen.append(path)
+                if len(seen) == 3:
+                    resume.set()
+            return seen
+
+        seen = asyncio.run(asyncio.wait_for(run(), 10))
+        self.assertEqual(sorted(seen[:3]), TEST_FILES[:3])
+        self.assertEqual(seen[3], TEST_FILES[3])
+
+    def test_cache_path(self):
+        tmp = tempfile.mkdtemp()
+        try:
+            db = os.path.join(tmp, 'labels.sqlite')
+            first = list(get_actor_name.parse_files(TEST_FILES, cache=db))
+            with get_actor_name.LabelCache(db) as cache:
+                self.assertEqual(list(get_actor_name.parse_files(TEST_FILES, cache=cache)),
+                                 first)
+                self.assertEqual(cache.hits, len(TEST_FILES))
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+
+class TestEnumerate(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        layout = ('Content/__ExternalActors__/Maps/Main/0/A.uasset',
+                  'Content/__ExternalActors__/Maps/Main/1/B.UASSET',
+                  'Content/__ExternalObjects__/Maps/Main/C.uasset',
+                  'Content/Props/D.uasset',
+                  'Content/Props/notes.txt',
+                  'Plugins/P/Content/__ExternalActors__/E.uasset',
+                  'Plugins/P/Content/Meshes/F.uasset',
+                  'Saved/__ExternalActors__/G.uasset',
+                  'H.uasset')
+        for rel in layout:
+            path = os.path.join(self.tmp, *rel.split('/'))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            open(path, 'wb').close()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def relative(self, paths):
+        return [os.path.relpath(p, self.tmp).replace(os.sep, '/') for p in paths]
+
+    def test_matches_os_walk(self):
+        expected = [os.path.join(root, f) for root, _, files in os.walk(self.tmp)
+                    for f in files if f.lower().endswith('.uasset')]
+        self.assertEqual(list(get_actor_name._iter_uasset_files(self.tmp)), expected)
+
+    def test_ofpa_only_prunes(self):
+        found = self.relative(get_actor_name._iter_uasset_files(self.tmp, ofpa_only=True))
+        self.assertEqual(sorted(found), [
+            'Content/__ExternalActors__/Maps/Main/0/A.uasset',
+            'Content/__ExternalActors__/Maps/Main/1/B.UASSET',
+            'Content/__ExternalObjects__/Maps/Main/C.uasset',
+            'Plugins/P/Content/__ExternalActors__/E.uasset'])
+        inner = os.path.join(self.tmp, 'Content', '__ExternalActors__', 'Maps')
+        self.assertEqual(len(list(get_actor_name._iter_uasset_files(inner, True))), 2)
+
+
+class TestLabelIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.root = os.path.join(self.tmp, 'Content')
+        self.db = os.path.join(self.tmp, 'index.sqlite')
+        self.assets = []
+        for n, src in enumerate(TEST_FILES):
+            folder = os.path.join(self.root, '__ExternalActors__', 'Maps', f'M{n % 2}')
+            os.makedirs(folder, exist_ok=True)
+            self.assets.append(os.path.join(folder, os.path.basename(src)))
+            shutil.copy(src, self.assets[-1])
+        self.labels = {p: get_actor_name.parse_file(p) for p in self.assets}
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_lookups(self):
+        with get_actor_name.LabelIndex(self.db) as index:
+            self.assertEqual(index.update(self.root), (len(self.assets), 0, 0))
+            path, (label_type, label) = next(iter(self.labels.items()))
+            self.assertEqual(index.label(path), (label_type, label))
+            self.assertIn((path, (label_type, label)), index.find(label.upper()))
+            self.assertIn((path, (label_type, label)), index.find(label[:3], 'prefix'))
+            for text in (label[1:-1], label[1:3]):
+                self.assertIn((path, (label_type, label)), index.find(text, 'substring'))
+            other = os.path.join(self.root, '__ExternalActors__', 'Maps', 'M9')
+            self.assertEqual(index.find(label, under=other), [])
+            self.assertEqual(index.find('50%_', 'substring'), [])
+
+    def test_incremental_update(self):
+        with get_actor_name.LabelIndex(self.db) as index:
+            index.update(self.root)
+            self.assertEqual(index.update(self.root), (0, 0, 0))
+            changed, removed = self.assets[0], self.assets[1]
+            shutil.copy(TEST_FILES[-1], changed)
+            st = os.stat(changed)
+            os.utime(changed, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+            os.remove(removed)
+            self.assertEqual(index.update(self.root), (0, 1, 1))
+            self.assertEqual(index.label(changed), self.labels[self.assets[-1]])
+            self.assertIsNone(index.label(removed))
+
+
+class TestLabelWatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.a = os.path.join(self.tmp, 'A.uasset')
+        self.b = os.path.join(self.tmp, 'B.uasset')
+        shutil.copy(TEST_FILES[0], self.a)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def touch_copy(self, src, dest):
+        shutil.copy(src, dest)
+        st = os.stat(dest)
+        os.utime(dest, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    def events(self, watcher):
+        return sorted((e['event'], os.path.basename(e['path']), e['label'], e['old_label'])
+                      for e in watcher.poll())
+
+    def test_events(self):
+        first = get_actor_name.parse_file(TEST_FILES[0])[1]
+        last = get_actor_name.parse_file(TEST_FILES[-1])[1]
+        watcher = get_actor_name.LabelWatcher([self.tmp])
+        self.assertEqual(self.events(watcher), [('added', 'A.uasset', first, None)])
+        self.assertEqual(self.events(watcher), [])
+        self.touch_copy(TEST_FILES[-1], self.a)
+        shutil.copy(TEST_FILES[-1], self.b)
+        self.assertEqual(self.events(watcher), [('added', 'B.uasset', last, None),
+                                                ('relabeled', 'A.uasset', last, first)])
+        os.remove(self.b)
+        with open(self.a, 'r+b') as f:
+            f.truncate(16)
+        os.utime(self.a, ns=(0, os.stat(self.a).st_mtime_ns + 2_000_000_000))
+        self.assertEqual(self.events(watcher), [('removed', 'A.uasset', None, last),
+                                                ('removed', 'B.uasset', None, last)])
+
+    def test_process_watch_writes_json_lines(self):
+        import io
+        import json
+        stream = io.StringIO()
+        get_actor_name.process_watch([self.tmp], interval=0, stream=stream, polls=2)
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual([line['event'] for line in lines], ['added', 'ready'])
+        self.assertEqual(lines[1]['labeled'], 1)
+
+
+class TestLabelCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.db = os.path.join(self.tmp, 'labels.sqlite')
+        self.asset = os.path.join(self.tmp, 'A.uasset')
+        shutil.copy(TEST_FILES[0], self.asset)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_hits_after_first_run(self):
+        expected = get_actor_name.parse_file(self.asset)
+        with get_actor_name.LabelCache(self.db) as cache:
+            self.assertEqual(cache.parse(self.asset), expected)
+            self.assertEqual((cache.hits, cache.misses), (0, 1))
+        with get_actor_name.LabelCache(self.db) as cache:
+            self.assertEqual(cache.parse(self.asset), expected)
+            self.assertEqual((cache.hits, cache.misses), (1, 0))
+
+    def test_changed_file_is_reparsed(self):
+        with get_actor_name.LabelCache(self.db) as cache:
+            cache.parse(self.asset)
+        shutil.copy(TEST_FILES[-1], self.asset)
+        st = os.stat(self.asset)
+        os.utime(self.asset, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        with get_actor_name.LabelCache(self.db) as cache:
+            self.assertEqual(cache.parse(self.asset), get_actor_name.parse_file(TEST_FILES[-1]))
+            self.assertEqual(cache.misses, 1)
+
+    def test_read_error_not_cached(self):
+        unreadable = os.path.join(self.tmp, 'X.uasset')
+        os.mkdir(unreadable)
+        for backend in ('thread', 'process'):
+            with self.subTest(backend=backend):
+                for _ in range(2):
+                    with get_actor_name.LabelCache(self.db) as cache:
+                        (_, result), = get_actor_name.parse_files(
+                            [unreadable], jobs=2, cache=cache, backend=backend)
+                        self.assertTrue(result.startswith(get_actor_name.READ_ERROR_PREFIX))
+                        self.assertEqual((cache.hits, cache.misses), (0, 1))
+
+
+class TestBlobLabelCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.db = os.path.join(self.tmp, 'labels.sqlite')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_oid_matches_git(self):
+        # Precomputed with `git hash-object`
+        data = b'abc'
+        self.assertEqual(get_actor_name.git_blob_oid(data),
+                         'f2ba8f84ab5c1bce84a7b441cb1959cfc7093b7f')
+
+    def test_same_content_different_path_hits(self):
+        copy = os.path.join(self.tmp, 'Other.uasset')
+        shutil.copy(TEST_FILES[0], copy)
+        with get_actor_name.BlobLabelCache(self.db) as cache:
+            first = get_actor_name.parse_file(TEST_FILES[0], cache=cache)
+            self.assertEqual(get_actor_name.parse_file(copy, cache=cache), first)
+            self.assertEqual((cache.hits, cache.misses), (1, 1))
+        # Persistent tier survives a new instance, even with the oid supplied up front
+        oid = get_actor_name.git_blob_oid(read_bytes(copy))
+        with get_actor_name.BlobLabelCache(self.db) as cache:
+            self.assertEqual(cache.parse(os.path.join(self.tmp, 'gone.uasset'), oid=oid), first)
+            self.assertEqual(cache.hits, 1)
+
+    def test_unreadable_file_not_cached_under_oid(self):
+        data = read_bytes(TEST_FILES[0])
+        oid = get_actor_name.git_blob_oid(data)
+        with get_actor_name.BlobLabelCache(self.db) as cache:
+            missing = cache.parse(os.path.join(self.tmp, 'gone.uasset'), oid=oid)
+            self.assertFalse(missing)
+            self.assertTrue(missing.startswith("read error"))
+            self.assertEqual(cache.parse(TEST_FILES[0], oid=oid),
+                             get_actor_name.parse_file(TEST_FILES[0]))
+        with get_actor_name.BlobLabelCache(self.db) as cache:
+            self.assertEqual(cache.get(oid), get_actor_name.parse_file(TEST_FILES[0]))
+
+    def test_supplied_oid_checked_against_content(self):
+        empty = os.path.join(self.tmp, 'Empty.uasset')
+        open(empty, 'wb').close()
+        with get_actor_name.BlobLabelCache() as cache:
+            self.assertEqual(cache.parse(empty), get_actor_name.NOT_UASSET)
+            self.assertEqual(len(cache._lru), 0)
+            oid, result, hit = cache.resolve(TEST_FILES[0], oid='0' * 40)
+            self.assertEqual(oid, get_actor_name.git_blob_oid(read_bytes(TEST_FILES[0])))
+            self.assertFalse(hit)
+
+    def test_lru_bound(self):
+        cache = get_actor_name.BlobLabelCache(max_entries=2)
+        for path in TEST_FILES:
+            cache.parse_blob(read_bytes(path))
+        self.assertEqual(len(cache._lru), 2)
+        self.assertEqual(cache.parse_blob(read_bytes(TEST_FILES[-1])),
+                         get_actor_name.parse_file(TEST_FILES[-1]))
+        self.assertEqual(cache.hits, 1)
+
+
+@unittest.skipUnless(shutil.which('git'), "git not installed")
+class TestGitBlobReader(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        import subprocess
+        cls.repo = tempfile.mkdtemp()
+        git = ['git', '-C', cls.repo, '-c', 'user.name=t', '-c', 'user.email=t@t']
+        subprocess.run(['git', 'init', '-q', cls.repo], check=True)
+        for i, path in enumerate(TEST_FILES):
+            shutil.copy(path, os.path.join(cls.repo, f'A{i}.uasset'))
+        subprocess.run(git + ['add', '.'], check=True)
+        subprocess.run(git + ['commit', '-qm', 'init'], check=True)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.repo, ignore_errors=True)
+
+    def test_close_after_early_stop(self):
+        import time
+        names = [f'HEAD:A{i}.uasset' for i in range(len(TEST_FILES))] * 200
+        reader = get_actor_name.GitBlobReader(self.repo)
+        blobs = reader.iter_blobs(names)
+        self.assertEqual(next(blobs)[2], read_bytes(TEST_FILES[0]))
+        time.sleep(0.2)  # let git fill the stdout pipe
+        start = time.perf_counter()
+        reader.close()
+        self.assertLess(time.perf_counter() - start, get_actor_name.GIT_CLOSE_TIMEOUT)
+
+    def test_flush_points(self):
+        events = []
+        with get_actor_name.GitBlobReader(self.repo) as reader:
+            for name, oid, data in reader.iter_blobs(['HEAD:A0.uasset', None, 'HEAD:A1.uasset'],
+                                                     lambda: events.append('flush')):
+                events.append(name)
+        self.assertEqual(events, ['HEAD:A0.uasset', 'flush', 'HEAD:A1.uasset'])
+
+    def test_server_replaces_dead_reader(self):
+        request = {'jsonrpc': '2.0', 'id': 1, 'method': 'decode_objects',
+                   'params': {'names': ['HEAD:A0.uasset'], 'repo': self.repo}}
+        server = get_actor_name.LabelServer()
+        try:
+            first = server.handle(request)['result']
+            server._readers[self.repo]._proc.kill()
+            self.assertEqual(server.handle(request)['error']['code'], -32000)
+            self.assertNotIn(self.repo, server._readers)
+            self.assertEqual(server.handle(request)['result'], first)
+        finally:
+            server.close()
+
+
+class TestLabelServer(unittest.TestCase):
+
+    def test_invalid_params(self):
+        server = get_actor_name.LabelServer()
+        try:
+            for method, params in (('decode', {'paths': TESTS_DIR}),
+                                   ('decode', {'paths': [1]}),
+                                   ('decode', [TESTS_DIR]),
+                                   ('decode_objects', {'names': ['HEAD:x'], 'repo': 1}),
+                                   ('decode_objects', {})):
+                with self.subTest(method=method, params=params):
+                    response = server.handle({'jsonrpc': '2.0', 'id': 1, 'method': method,
+                                              'params': params})
+                    self.assertEqual(response['error']['code'], -32602)
+        finally:
+            server.close()
+
+
+if __name__ == '__main__':
+    unittest.main()